@@ -152,7 +152,7 @@ class FileType(Enum):
     # noinspection PyTypeChecker
     @classmethod
     def get_type_from_extension(cls, extension):
-        return next((t for t in cls if extension.lower() in t.extensions), cls.UNKNOWN)
+        return _FILE_TYPES_BY_EXTENSION.get(extension.lower(), cls.UNKNOWN)
 
     @classmethod
     def get_type_from_name(cls, name):
@@ -176,6 +176,22 @@ class FileType(Enum):
         return self.is_type('image')
 
 
+def _get_file_types_by_extension():
+    """Map each extension to the first :py:class:`FileType` which declares it, so that the type for a given extension is
+    determined by a single lookup
+
+    :return: :py:class:`dict` mapping extension to :py:class:`FileType` member
+    """
+    file_types_by_extension = {}
+    for file_type in FileType:
+        for extension in file_type.extensions:
+            file_types_by_extension.setdefault(extension, file_type)
+    return file_types_by_extension
+
+
+_FILE_TYPES_BY_EXTENSION = _get_file_types_by_extension()
+
+
 class PipelineFileCheckType(Enum):
     """Each :py:class:`PipelineFile` may individually specify which checks are performed against it
     """
@@ -30,6 +30,10 @@ from netCDF4 import Dataset
 
 from .exceptions import InvalidFileFormatError, InvalidFileNameError, InvalidFileContentError
 
+# bound substitution method of the pre-compiled pattern matching the file extension, to avoid the re module's pattern
+# cache lookup each time a file name is split
+_strip_extension = re.compile(r'.\w*$').sub
+
 
 class FileClassifier(object):
     """Base class for working out where a file should be published."""
@@ -41,7 +45,7 @@ class FileClassifier(object):
         """
         # trim off dirs & extention
         basename = os.path.basename(input_file)
-        just_the_name = re.sub(r'.\w*$', '', basename)
+        just_the_name = _strip_extension('', basename)
 
         fields = just_the_name.split('_')
         if len(fields) < min_fields:
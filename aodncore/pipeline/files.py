@@ -1,18 +1,25 @@
 import abc
 import mimetypes
 import os
+import re
+import sys
 import warnings
-from collections import Counter, MutableSet, OrderedDict
+from collections import defaultdict
+from collections.abc import MutableSet
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain, compress, filterfalse, repeat
+from operator import attrgetter, eq, is_, is_not
 
 from .common import (FileType, PipelineFilePublishType, PipelineFileCheckType, validate_addition_publishtype,
                      validate_checkresult, validate_deletion_publishtype, validate_publishtype,
                      validate_settable_checktype)
 from .exceptions import AttributeValidationError, DuplicatePipelineFileError, MissingFileError
 from .schema import validate_check_params
-from ..util import (IndexedSet, classproperty, ensure_regex_list, format_exception, get_file_checksum,
-                    iter_public_attributes, matches_regexes, rm_f, slice_sequence, validate_bool, validate_callable,
-                    validate_int, validate_mapping, validate_nonstring_iterable, validate_regexes,
-                    validate_relative_path_attr, validate_string, validate_type)
+from ..util import (IndexedSet, Pattern, classproperty, ensure_regex_list, format_exception, get_file_checksum, rm_f,
+                    slice_sequence, validate_bool, validate_callable, validate_int, validate_nonstring_iterable,
+                    validate_regexes, validate_relative_path_attr, validate_string, validate_type)
 
 __all__ = [
     'PipelineFileCollection',
@@ -26,6 +33,167 @@ __all__ = [
     'validate_pipelinefile_or_string'
 ]
 
+# precomputed (should_archive, should_harvest, should_store) flags for each publish type, to avoid the enum property
+# lookups each time a publish_type is assigned
+_PUBLISH_TYPE_FLAGS = {t: (t.is_archive_type, t.is_harvest_type, t.is_store_type) for t in PipelineFilePublishType}
+
+# PipelineFile state flags with property setters which only validate the value as a bool before assigning it with
+# PipelineFile._set_validated_bool_state, which may therefore be called directly by bulk operations which have already
+# validated the value
+_BOOL_STATE_ATTRIBUTES = frozenset({'is_archived', 'is_harvested', 'is_harvest_undone', 'is_overwrite', 'is_stored',
+                                    'is_upload_undone'})
+
+# global inline flag groups (e.g. '(?i)'), which are only valid at the start of a pattern and so prevent the pattern
+# from being combined into an alternation
+_INLINE_FLAGS_PATTERN = re.compile(r'\(\?[aiLmsux]+\)')
+
+
+@lru_cache(maxsize=256)
+def _get_mime_type(file_type, extension):
+    """Get the mime type for a file type and extension, falling back to the extension's registered type"""
+    return file_type.mime_type or mimetypes.types_map.get(extension, 'application/octet-stream')
+
+
+@lru_cache(maxsize=64)
+def _compile_regex_tuple(regexes):
+    return tuple(ensure_regex_list(regexes))
+
+
+def _ensure_regex_tuple(regexes):
+    """Return a tuple of compiled regular expressions from the given input, in the same manner as
+    :py:func:`ensure_regex_list`, except that the compiled result is cached for each unique set of regexes, so that
+    repeated filtering with the same configured patterns only validates and compiles them once
+
+    :param regexes: a single regex or a sequence of regexes (string or pre-compiled)
+    :return: :py:class:`tuple` of :py:class:`Pattern` instances
+    """
+    if regexes is None:
+        return ()
+    key = (regexes,) if isinstance(regexes, (str, Pattern)) else tuple(regexes)
+    return _compile_regex_tuple(key)
+
+
+@lru_cache(maxsize=64)
+def _get_regexes_matcher(regexes):
+    """Return a callable which tests whether a string matches any of the given compiled patterns (e.g. as returned by
+    :py:func:`_ensure_regex_tuple`) with a single call into the regex engine, by combining the patterns into one
+    alternation which is compiled once for each unique set of patterns
+
+    Patterns are only combined when they share the same flags and contain no groups (which could be referred to by
+    number in a backreference, and would be renumbered in the alternation) or global inline flags (which must be at the
+    start of the expression), otherwise each pattern is tried in turn.
+
+    :param regexes: :py:class:`tuple` of compiled patterns
+    :return: callable accepting a string and returning a truthy value if it matches one of the patterns
+    """
+    if not regexes:
+        return lambda s: None
+    if len(regexes) == 1:
+        return regexes[0].match
+
+    flags = {r.flags for r in regexes}
+    if len(flags) == 1 and not any(r.groups or _INLINE_FLAGS_PATTERN.search(r.pattern) for r in regexes):
+        try:
+            alternation = re.compile('|'.join('(?:{})'.format(r.pattern) for r in regexes), flags.pop())
+        except re.error:
+            pass
+        else:
+            return alternation.match
+
+    def match_any(s):
+        return any(r.match(s) for r in regexes)
+
+    return match_any
+
+
+def _attributes_getter(attributes):
+    """Return a callable which fetches all of the named attributes from an object as a :py:class:`tuple` in a single
+    call, including when only one (or no) attribute name is given, for which :py:func:`operator.attrgetter` would
+    otherwise return a scalar (or raise)
+
+    :param attributes: a single attribute name, or a sequence of attribute names
+    :return: callable accepting an object and returning a :py:class:`tuple` of attribute values
+    """
+    if isinstance(attributes, str):
+        attributes = (attributes,)
+    if not attributes:
+        return lambda o: ()
+    if len(attributes) == 1:
+        get_attribute = attrgetter(attributes[0])
+        return lambda o: (get_attribute(o),)
+    return attrgetter(*attributes)
+
+
+def _select_all_true(files, attributes):
+    """Select the files for which all of the named attributes are True, with the selection evaluated entirely by C-level
+    builtins (i.e. without a Python-level predicate being called for each file)
+
+    A chain of one lazy :py:func:`filter` per attribute is used, so that each file is only tested against the
+    next attribute if it passed the previous one, rather than every attribute (some of which are computed properties)
+    being fetched for every file.
+
+    :param files: iterable of files
+    :param attributes: :py:class:`tuple` of attribute names
+    :return: iterator over the selected files
+    """
+    selected = iter(files)
+    for attribute in attributes:
+        selected = filter(attrgetter(attribute), selected)
+    return selected
+
+
+def _select_all_false(files, attributes):
+    """Select the files for which all of the named attributes are False, in the same way as :py:func:`_select_all_true`
+
+    :param files: iterable of files
+    :param attributes: :py:class:`tuple` of attribute names
+    :return: iterator over the selected files
+    """
+    selected = iter(files)
+    for attribute in attributes:
+        selected = filterfalse(attrgetter(attribute), selected)
+    return selected
+
+
+@lru_cache(maxsize=None)
+def _get_public_attributes_getter(cls):
+    """Get the public attribute names for a given :py:class:`PipelineFileBase` subclass, along with a callable which
+    fetches the values of all of those attributes from an instance in a single call
+
+    The attribute names are determined in the same way as :py:func:`iter_public_attributes`, but since they depend
+    only on the class (i.e. the slots and properties it defines), they are only determined once for each class. The
+    names are sorted, so that the order of the resulting mappings (and table columns) is the same in every process.
+
+    :param cls: :py:class:`PipelineFileBase` subclass
+    :return: :py:class:`tuple` containing a :py:class:`tuple` of attribute names and the getter callable
+    """
+    attribute_names = set(getattr(cls, '__slots__', ()))
+    property_names = {p for p in dir(cls) if isinstance(getattr(cls, p), property)}
+    public_names = tuple(sorted(a for a in attribute_names.union(property_names) if not a.startswith('_')))
+    return public_names, _attributes_getter(public_names)
+
+
+@lru_cache(maxsize=None)
+def _get_attributes_getter(attributes):
+    """Cached equivalent of :py:func:`_attributes_getter`, for attribute names which are fixed for a class (e.g.
+    `unique_attributes`), so that the getter is only created once
+
+    :param attributes: hashable sequence of attribute names
+    :return: callable accepting an object and returning a :py:class:`tuple` of attribute values
+    """
+    return _attributes_getter(attributes)
+
+
+def _get_public_attributes_dict(instance):
+    """Get a :py:class:`dict` of the public attributes of a :py:class:`PipelineFileBase` instance, equivalent to
+    `dict(instance)` but without going through the instance's iterator
+
+    :param instance: :py:class:`PipelineFileBase` instance
+    :return: :py:class:`dict` mapping each public attribute name to its value
+    """
+    public_names, get_public_attributes = _get_public_attributes_getter(type(instance))
+    return dict(zip(public_names, get_public_attributes(instance)))
+
 
 def ensure_pipelinefilecollection(o):
     """Function to accept either a single PipelineFile OR a PipelineFileCollection and ensure that a
@@ -65,7 +233,9 @@ class PipelineFileBase(object, metaclass=abc.ABCMeta):
 
     def _set_local_file_attributes(self):
         if self.local_path:
-            _, self._extension = os.path.splitext(self.local_path)
+            # extensions have very low cardinality across files, so intern them to share a single string object
+            _, extension = os.path.splitext(self.local_path)
+            self._extension = sys.intern(extension)
             self.file_type = FileType.get_type_from_extension(self._extension)
         else:
             self._extension = None
@@ -84,13 +254,14 @@ class PipelineFileBase(object, metaclass=abc.ABCMeta):
         raise NotImplementedError
 
     def __iter__(self):
-        return iter_public_attributes(self)
+        public_names, get_public_attributes = _get_public_attributes_getter(type(self))
+        return zip(public_names, get_public_attributes(self))
 
     def __repr__(self):  # pragma: no cover
-        return "{name}({repr})".format(name=self.__class__.__name__, repr=repr(dict(self)))
+        return "{name}({repr})".format(name=self.__class__.__name__, repr=repr(_get_public_attributes_dict(self)))
 
     def __str__(self):
-        return "{name}({str})".format(name=self.__class__.__name__, str=dict(self))
+        return "{name}({str})".format(name=self.__class__.__name__, str=_get_public_attributes_dict(self))
 
     #
     # Static properties (read-only, should never change during the lifecycle of the object)
@@ -216,7 +387,7 @@ class PipelineFile(PipelineFileBase):
     __slots__ = ['_archive_path', '_file_update_callback', '_check_type', '_is_deletion', '_late_deletion',
                  '_publish_type', '_should_archive', '_should_harvest', '_should_store', '_should_undo', '_is_checked',
                  '_is_archived', '_is_harvested', '_is_overwrite', '_is_stored', '_is_harvest_undone',
-                 '_is_upload_undone', '_check_result', '_mime_type']
+                 '_is_upload_undone', '_check_result', '_mime_type', '_hash', '_pending_updates']
 
     def __init__(self, local_path, name=None, archive_path=None, dest_path=None, is_deletion=False,
                  late_deletion=False, file_update_callback=None, check_type=None, publish_type=None):
@@ -231,6 +402,8 @@ class PipelineFile(PipelineFileBase):
         # general file attributes, *not* set from parameters
         self._check_result = None
         self._mime_type = None
+        self._hash = None
+        self._pending_updates = None
 
         # processing flags - these express the *intended actions* for the file
         self._should_archive = False
@@ -282,6 +455,21 @@ class PipelineFile(PipelineFileBase):
                    name=name, is_deletion=is_deletion, late_deletion=late_deletion,
                    file_update_callback=file_update_callback, check_type=check_type, publish_type=publish_type)
 
+    def __eq__(self, other):
+        # equivalent to comparing _key(), but compares the cheap components first so that the checksum of either file is
+        # only computed when the name and path are equal
+        if isinstance(other, type(self)):
+            return (self._name == other._name and self._local_path == other._local_path and
+                    self.file_checksum == other.file_checksum)
+        return False
+
+    def __hash__(self):
+        # name, local_path and file_checksum can't change once the checksum has been computed, so the hash of the key is
+        # only calculated once
+        if self._hash is None:
+            self._hash = hash(self._key())
+        return self._hash
+
     def _key(self):
         return self.name, self.local_path, self.file_checksum
 
@@ -292,7 +480,7 @@ class PipelineFile(PipelineFileBase):
     @property
     def file_checksum(self):
         # override superclass property to handle deletions (which have no local_path and therefore can't be summed)
-        if self.is_deletion:
+        if self._is_deletion:
             return None
         return super().file_checksum
 
@@ -308,7 +496,7 @@ class PipelineFile(PipelineFileBase):
     def archive_path(self, archive_path):
         validate_relative_path_attr(archive_path, 'archive_path')
         self._archive_path = archive_path
-        self._post_property_update({'archive_path': archive_path})
+        self._post_property_update('archive_path', archive_path)
 
     @property
     def check_log(self):
@@ -328,7 +516,7 @@ class PipelineFile(PipelineFileBase):
 
         self._is_checked = True
         self._check_result = check_result
-        self._post_property_update({'is_checked': True})
+        self._post_property_update('is_checked', True)
 
     @property
     def check_type(self):
@@ -336,12 +524,11 @@ class PipelineFile(PipelineFileBase):
 
     @check_type.setter
     def check_type(self, check_type):
-        if self.is_deletion:
+        if self._is_deletion:
             raise ValueError('deletions cannot be assigned a check_type')
         validate_settable_checktype(check_type)
 
-        self._check_type = check_type
-        self._post_property_update({'check_type': check_type.name})
+        self._set_validated_check_type(check_type)
 
     @property
     def dest_path(self):
@@ -351,7 +538,7 @@ class PipelineFile(PipelineFileBase):
     def dest_path(self, dest_path):
         validate_relative_path_attr(dest_path, 'dest_path')
         self._dest_path = dest_path
-        self._post_property_update({'dest_path': dest_path})
+        self._post_property_update('dest_path', dest_path)
 
     @property
     def file_update_callback(self):
@@ -370,8 +557,7 @@ class PipelineFile(PipelineFileBase):
     @is_harvested.setter
     def is_harvested(self, is_harvested):
         validate_bool(is_harvested)
-        self._is_harvested = is_harvested
-        self._post_property_update({'is_harvested': is_harvested})
+        self._set_validated_bool_state('is_harvested', is_harvested)
 
     @property
     def is_archived(self):
@@ -381,8 +567,7 @@ class PipelineFile(PipelineFileBase):
     def is_archived(self, is_archived):
         validate_bool(is_archived)
 
-        self._is_archived = is_archived
-        self._post_property_update({'is_archived': is_archived})
+        self._set_validated_bool_state('is_archived', is_archived)
 
     @property
     def is_checked(self):
@@ -398,7 +583,7 @@ class PipelineFile(PipelineFileBase):
 
     @property
     def is_deleted(self):
-        return self.is_deletion and self.is_stored
+        return self._is_deletion and self._is_stored
 
     @property
     def is_overwrite(self):
@@ -408,8 +593,7 @@ class PipelineFile(PipelineFileBase):
     def is_overwrite(self, is_overwrite):
         validate_bool(is_overwrite)
 
-        self._is_overwrite = is_overwrite
-        self._post_property_update({'is_overwrite': is_overwrite})
+        self._set_validated_bool_state('is_overwrite', is_overwrite)
 
     @property
     def is_stored(self):
@@ -423,8 +607,7 @@ class PipelineFile(PipelineFileBase):
     def is_harvest_undone(self, is_harvest_undone):
         validate_bool(is_harvest_undone)
 
-        self._is_harvest_undone = is_harvest_undone
-        self._post_property_update({'is_harvest_undone': is_harvest_undone})
+        self._set_validated_bool_state('is_harvest_undone', is_harvest_undone)
 
     @property
     def is_upload_undone(self):
@@ -434,25 +617,22 @@ class PipelineFile(PipelineFileBase):
     def is_upload_undone(self, is_upload_undone):
         validate_bool(is_upload_undone)
 
-        self._is_upload_undone = is_upload_undone
-        self._post_property_update({'is_upload_undone': is_upload_undone})
+        self._set_validated_bool_state('is_upload_undone', is_upload_undone)
 
     @is_stored.setter
     def is_stored(self, is_stored):
         validate_bool(is_stored)
 
-        self._is_stored = is_stored
-        self._post_property_update({'is_stored': is_stored})
+        self._set_validated_bool_state('is_stored', is_stored)
 
     @property
     def is_uploaded(self):
-        return not self.is_deletion and self.is_stored
+        return not self._is_deletion and self._is_stored
 
     @property
     def mime_type(self):
         if not self._mime_type:
-            self._mime_type = self.file_type.mime_type or mimetypes.types_map.get(self.extension,
-                                                                                  'application/octet-stream')
+            self._mime_type = _get_mime_type(self.file_type, self._extension)
         return self._mime_type
 
     @mime_type.setter
@@ -460,13 +640,13 @@ class PipelineFile(PipelineFileBase):
         validate_string(mime_type)
 
         self._mime_type = mime_type
-        self._post_property_update({'mime_type': mime_type})
+        self._post_property_update('mime_type', mime_type)
 
     @property
     def published(self):
-        stored = self.is_stored and not self.is_upload_undone
-        harvested = self.is_harvested and not self.is_harvest_undone
-        if self.should_store and self.should_harvest:
+        stored = self._is_stored and not self._is_upload_undone
+        harvested = self._is_harvested and not self._is_harvest_undone
+        if self._should_store and self._should_harvest:
             published = stored and harvested
         else:
             published = stored or harvested
@@ -474,47 +654,47 @@ class PipelineFile(PipelineFileBase):
 
     @property
     def pending_archive(self):
-        return self.should_archive and not self.is_archived
+        return self._should_archive and not self._is_archived
 
     @property
     def pending_harvest(self):
-        return self.should_harvest and not self.is_harvested and not self.should_undo
+        return self._should_harvest and not self._is_harvested and not self._should_undo
 
     @property
     def pending_harvest_addition(self):
-        return self.pending_harvest and not self.is_deletion
+        return self.pending_harvest and not self._is_deletion
 
     @property
     def pending_harvest_deletion(self):
-        return self.pending_harvest and self.is_deletion
+        return self.pending_harvest and self._is_deletion
 
     @property
     def pending_harvest_early_deletion(self):
-        return self.pending_harvest and self.is_deletion and not self.late_deletion
+        return self.pending_harvest and self._is_deletion and not self._late_deletion
 
     @property
     def pending_harvest_late_deletion(self):
-        return self.pending_harvest and self.is_deletion and self.late_deletion
+        return self.pending_harvest and self._is_deletion and self._late_deletion
 
     @property
     def pending_harvest_undo(self):
-        return self.should_undo and self.should_harvest and not self.is_harvest_undone
+        return self._should_undo and self._should_harvest and not self._is_harvest_undone
 
     @property
     def pending_store(self):
-        return self.should_store and not self.is_stored and not self.should_undo
+        return self._should_store and not self._is_stored and not self._should_undo
 
     @property
     def pending_store_addition(self):
-        return self.pending_store and not self.is_deletion
+        return self.pending_store and not self._is_deletion
 
     @property
     def pending_store_deletion(self):
-        return self.pending_store and self.is_deletion
+        return self.pending_store and self._is_deletion
 
     @property
     def pending_store_undo(self):
-        return self.should_undo and self.should_store and not self.is_upload_undone
+        return self._should_undo and self._should_store and not self._is_upload_undone
 
     @property
     def pending_undo(self):
@@ -535,15 +715,10 @@ class PipelineFile(PipelineFileBase):
         """
         validate_publishtype(publish_type)
 
-        validate_value_func = validate_deletion_publishtype if self.is_deletion else validate_addition_publishtype
+        validate_value_func = validate_deletion_publishtype if self._is_deletion else validate_addition_publishtype
         validate_value_func(publish_type)
 
-        self._should_archive = publish_type.is_archive_type
-        self._should_harvest = publish_type.is_harvest_type
-        self._should_store = publish_type.is_store_type
-
-        self._publish_type = publish_type
-        self._post_property_update({'publish_type': publish_type.name})
+        self._set_validated_publish_type(publish_type)
 
     @property
     def should_archive(self):
@@ -565,25 +740,84 @@ class PipelineFile(PipelineFileBase):
     def should_undo(self, should_undo):
         validate_bool(should_undo)
 
-        if self.is_deletion:
+        if self._is_deletion:
             raise ValueError('undo is not possible for deletions')
 
         self._should_undo = should_undo
-        self._post_property_update({'should_undo': should_undo})
+        self._post_property_update('should_undo', should_undo)
+
+    def _set_validated_bool_state(self, attribute, value):
+        """Assign one of the bool state flags (see :py:const:`_BOOL_STATE_ATTRIBUTES`) from a value which has already
+        been validated, and report the update
+
+        :param attribute: name of the state flag property
+        :param value: :py:class:`bool` value
+        :return: None
+        """
+        setattr(self, '_' + attribute, value)
+        self._post_property_update(attribute, value)
+
+    def _set_validated_check_type(self, check_type):
+        """Assign a check_type which has already been validated as settable for this file, and report the update
 
-    def _post_property_update(self, properties, include_values=True):
+        :param check_type: :py:class:`PipelineFileCheckType` enum member
+        :return: None
+        """
+        self._check_type = check_type
+        self._post_property_update('check_type', check_type.name)
+
+    def _set_validated_publish_type(self, publish_type):
+        """Assign a publish_type (and the should_* flags derived from it) which has already been validated for this
+        file, and report the update
+
+        :param publish_type: :py:class:`PipelineFilePublishType` enum member
+        :return: None
+        """
+        self._should_archive, self._should_harvest, self._should_store = _PUBLISH_TYPE_FLAGS[publish_type]
+        self._publish_type = publish_type
+        self._post_property_update('publish_type', publish_type.name)
+
+    def _post_property_update(self, property_name, value, include_values=True):
         """Method run after a property is updated in order to perform optional actions such as updating ORM (if enabled)
             and running the update callback (if set)
 
-        :param properties: dict containing the updated properties and their new values (used to update ORM)
+        :param property_name: name of the updated property
+        :param value: new value of the updated property
+        :param include_values: :py:class:`bool` which, if True, will include the new value in the callback message
         :return: None
         """
-        validate_mapping(properties)
+        # no callback is the common case, so avoid doing any formatting work unless one is set
+        file_update_callback = self._file_update_callback
+        if file_update_callback is None:
+            return
+
+        # the message is formatted identically to the repr of a {property_name: value} (or [property_name]) container,
+        # without having to allocate one
+        if include_values:
+            update = "{property_name!r}: {value!r}".format(property_name=property_name, value=value)
+        else:
+            update = repr(property_name)
 
-        if self.file_update_callback:
-            log_output = properties if include_values else list(properties.keys())
-            self.file_update_callback(name=self.name, is_deletion=self.is_deletion,
-                                      message="{properties}".format(properties=log_output))
+        # while updates are batched, only the latest update to each property is recorded, to be sent in a single
+        # message by _flush_pending_updates
+        pending_updates = self._pending_updates
+        if pending_updates is not None:
+            pending_updates[property_name] = update
+            return
+
+        message = "{{{update}}}".format(update=update) if include_values else "[{update}]".format(update=update)
+        file_update_callback(name=self._name, is_deletion=self._is_deletion, message=message)
+
+    def _flush_pending_updates(self):
+        """Stop batching property updates, and send any updates recorded since batching began to the update callback
+            in a single message
+
+        :return: None
+        """
+        pending_updates, self._pending_updates = self._pending_updates, None
+        if pending_updates and self._file_update_callback is not None:
+            message = "{{{updates}}}".format(updates=', '.join(pending_updates.values()))
+            self._file_update_callback(name=self._name, is_deletion=self._is_deletion, message=message)
 
 
 class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
@@ -596,18 +830,33 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
     :param validate_unique: :py:class:`bool` passed to the `add` method
     :type data: :py:class:`PipelineFile`, :py:class:`RemotePipelineFile`, :py:class:`str`, :py:class:`Iterable`
     """
-    __slots__ = ['_s']
+    __slots__ = ['_s', '_path_index', '_unique_value_groups']
 
     def __init__(self, data=None, validate_unique=True):
         super().__init__()
 
         self._s = IndexedSet()
+        self._path_index = {}
+        self._unique_value_groups = None
 
         if data is not None:
             if isinstance(data, (self.member_class, str)):
                 data = [data]
-            for f in data:
-                self.add(f, validate_unique=validate_unique)
+            self.update(data, validate_unique=validate_unique)
+
+    @classmethod
+    def _from_validated_iterable(cls, iterable):
+        """Construct a new collection from an iterable whose elements are already known to be valid members (e.g.
+        elements taken from an existing collection), bypassing the per-element validation performed by `add`
+
+        :param iterable: :py:class:`Iterable` of member class instances
+        :return: new collection instance
+        """
+        collection = cls()
+        collection._s = IndexedSet(iterable)
+        for f in collection._s:
+            collection._add_to_path_index(f)
+        return collection
 
     @property
     @abc.abstractmethod
@@ -629,16 +878,37 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
     def unique_attributes(cls):
         raise NotImplementedError
 
+    @classproperty
+    def path_index_attribute(cls):
+        """Name of a path attribute which never changes for the lifetime of a member instance, by which the collection
+        is indexed to allow constant time lookups (or None to disable indexing)
+        """
+        return None
+
+    @property
+    def _members(self):
+        """Iterable of the members of the collection, in order, for scans which don't add or remove members
+
+        The iterator of the underlying :py:class:`IndexedSet` is a generator which skips over the placeholders left by
+        removed elements, so its item list is returned directly (and iterated at C speed) when there are none. The
+        placeholders are never compacted here, since that would shift the members under any iteration in progress.
+        """
+        s = self._s
+        return s if s.dead_indices else s.item_list
+
     def __bool__(self):
         return bool(self._s)
 
     def __contains__(self, v):
-        element = v if isinstance(v, self.member_class) else self.member_from_string_method(v)
-        return element in self._s
+        if isinstance(v, self.member_class):
+            return v in self._s
+        # any file returned by the (indexed) lookup from a path string is necessarily a member of the collection
+        return self.member_from_string_method(v) is not None
 
     def __getitem__(self, index):
-        result = self._s[index]
-        return self.__class__(result) if isinstance(result, IndexedSet) else result
+        if isinstance(index, slice):
+            return self._from_validated_iterable(self._s[index])
+        return self._s[index]
 
     def __iter__(self):
         return iter(self._s)
@@ -667,20 +937,41 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
             fileobj = self.member_class(pipeline_file, **kwargs)
 
         result = fileobj not in self._s
-        if not result and not overwrite:
-            raise DuplicatePipelineFileError("{f.name} already in collection".format(f=fileobj))
+        if not result:
+            if not overwrite:
+                raise DuplicatePipelineFileError("{f.name} already in collection".format(f=fileobj))
 
-        if overwrite:
+            # only an element which is actually present needs to be discarded, which avoids re-hashing the new file
+            # (and allocating its key) for the common case of adding a new file with overwrite=True
+            self._discard_from_path_index(fileobj)
             self._s.discard(fileobj)
             result = True
 
+            if self._unique_value_groups is not None:
+                self._unique_value_groups = self._group_by_unique_attributes()
+
+        # the unique attribute values are fetched once, and are commonly all unset (e.g. when a new file is added before
+        # its paths have been determined), in which case there is nothing to validate or record
+        unique_value_groups = self._unique_value_groups
+        unique_attribute_values = ()
+        if validate_unique or unique_value_groups is not None:
+            unique_attribute_values = [(attribute, value) for attribute, value in
+                                       zip(self.unique_attributes, self._get_unique_attributes(fileobj))
+                                       if value is not None]
+
         if validate_unique:
-            for attribute in self.unique_attributes:
-                value = getattr(fileobj, attribute)
-                if value is not None:
+            for attribute, value in unique_attribute_values:
+                if unique_value_groups is None:
                     self.validate_unique_attribute_value(attribute, value)
+                else:
+                    self._validate_unique_value_not_in_group(attribute, value, unique_value_groups[attribute])
 
         self._s.add(fileobj)
+        self._add_to_path_index(fileobj)
+
+        if unique_value_groups is not None:
+            for attribute, value in unique_attribute_values:
+                unique_value_groups[attribute][value].append(fileobj)
         return result
 
     # alias append to the add method
@@ -700,11 +991,33 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
 
         result = fileobj in self._s
 
+        if result:
+            self._discard_from_path_index(fileobj)
         self._s.discard(fileobj)
         return result
 
+    @staticmethod
+    def _get_membership_container(sequence):
+        """Get a container supporting constant time membership tests for the elements of the given sequence, without
+        copying the elements of another collection
+
+        :param sequence: :py:class:`Iterable` of elements
+        :return: container of the elements in the sequence
+        """
+        if isinstance(sequence, PipelineFileCollectionBase):
+            return sequence._s.item_index_map
+        if isinstance(sequence, (set, frozenset, dict)):
+            return sequence
+        return set(sequence)
+
     def difference(self, sequence):
-        return self.__class__(self._s.difference(sequence))
+        # the result is built directly from a single pass over the members, rather than via an intermediate IndexedSet
+        other = self._get_membership_container(sequence)
+        return self._from_validated_iterable(filterfalse(other.__contains__, self._members))
+
+    def intersection(self, sequence):
+        other = self._get_membership_container(sequence)
+        return self._from_validated_iterable(filter(other.__contains__, self._members))
 
     def issubset(self, sequence):
         return self._s.issubset(sequence)
@@ -713,9 +1026,15 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         return self._s.issuperset(sequence)
 
     def union(self, sequence):
-        if not all(isinstance(f, self.member_class) for f in sequence):
-            raise TypeError('invalid sequence, all elements must be PipelineFile objects')
-        return self.__class__(self._s.union(sequence))
+        # elements of a collection of the same type are already known to be valid, otherwise the sequence is
+        # materialised first, so that an iterator is not consumed by the type check before the union is performed
+        if isinstance(sequence, type(self)):
+            other = sequence._s
+        else:
+            other = list(sequence)
+            if not all(isinstance(f, self.member_class) for f in other):
+                raise TypeError('invalid sequence, all elements must be PipelineFile objects')
+        return self.__class__(self._s.union(other))
 
     def update(self, sequence, overwrite=False, validate_unique=True):
         """Add the elements of an existing :py:class:`Sequence` to this collection
@@ -729,9 +1048,18 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         """
         validate_nonstring_iterable(sequence)
 
+        # group the existing unique attribute values once for the whole sequence, so that the uniqueness of each added
+        # file is validated by lookups in the groups (which are kept up to date by the add method) instead of a scan of
+        # the entire collection for each file
+        if validate_unique:
+            self._unique_value_groups = self._group_by_unique_attributes()
+
         results = []
-        for item in sequence:
-            results.append(self.add(item, overwrite=overwrite, validate_unique=validate_unique))
+        try:
+            for item in sequence:
+                results.append(self.add(item, overwrite=overwrite, validate_unique=validate_unique))
+        finally:
+            self._unique_value_groups = None
         return any(results)
 
     def get_pipelinefile_from_dest_path(self, dest_path):
@@ -741,16 +1069,44 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         instance
         :return: matching :py:class:`RemotePipelineFile` instance or :py:const:`None` if it is not in the collection
         """
-        pipeline_file = next((f for f in self._s if f.dest_path == dest_path), None)
+        if self.path_index_attribute == 'dest_path':
+            return self._get_from_path_index(dest_path)
+        pipeline_file = next((f for f in self._members if f.dest_path == dest_path), None)
         return pipeline_file
 
+    def _add_to_path_index(self, fileobj):
+        attribute = self.path_index_attribute
+        if attribute is not None:
+            self._path_index.setdefault(getattr(fileobj, attribute), []).append(fileobj)
+
+    def _discard_from_path_index(self, fileobj):
+        attribute = self.path_index_attribute
+        if attribute is not None:
+            path = getattr(fileobj, attribute)
+            indexed_files = self._path_index.get(path)
+            if indexed_files and fileobj in indexed_files:
+                indexed_files.remove(fileobj)
+                if not indexed_files:
+                    del self._path_index[path]
+
+    def _get_from_path_index(self, path):
+        # the index holds files in the order they were added, so that the first match is the same as for a linear scan
+        try:
+            indexed_files = self._path_index.get(path)
+        except TypeError:
+            # an unhashable value can't equal any indexed path, so is not found (as it would not be by a linear scan)
+            return None
+        return indexed_files[0] if indexed_files else None
+
     def get_pipelinefile_from_src_path(self, src_path):
         """Get PipelineFile for a given src_path
 
         :param src_path: source path string for which to retrieve corresponding :py:class:`PipelineFile` instances
         :return: matching :py:class:`PipelineFile` instance or :py:const:`None` if it is not in the collection
         """
-        pipeline_file = next((f for f in self._s if f.local_path == src_path), None)
+        if self.path_index_attribute == 'local_path':
+            return self._get_from_path_index(src_path)
+        pipeline_file = next((f for f in self._members if f.local_path == src_path), None)
         return pipeline_file
 
     def get_slices(self, slice_size):
@@ -772,7 +1128,8 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: :py:class:`PipelineFileCollection` containing only :py:class:`PipelineFile` instances with the given
             attribute matching the given value
         """
-        collection = self.__class__((f for f in self._s if getattr(f, attribute) is value), validate_unique=False)
+        selectors = map(is_, map(attrgetter(attribute), self._members), repeat(value))
+        collection = self._from_validated_iterable(compress(self._members, selectors))
         return collection
 
     def filter_by_attribute_id_not(self, attribute, value):
@@ -784,7 +1141,8 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: :py:class:`PipelineFileCollection` containing only :py:class:`PipelineFile` instances with the given
             attribute not matching the given value
         """
-        collection = self.__class__((f for f in self._s if getattr(f, attribute) is not value), validate_unique=False)
+        selectors = map(is_not, map(attrgetter(attribute), self._members), repeat(value))
+        collection = self._from_validated_iterable(compress(self._members, selectors))
         return collection
 
     def filter_by_attribute_value(self, attribute, value):
@@ -796,7 +1154,8 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: :py:class:`PipelineFileCollection` containing only :py:class:`PipelineFile`instances with the given
             attribute matching the given value
         """
-        collection = self.__class__((f for f in self._s if getattr(f, attribute) == value), validate_unique=False)
+        selectors = map(eq, map(attrgetter(attribute), self._members), repeat(value))
+        collection = self._from_validated_iterable(compress(self._members, selectors))
         return collection
 
     def filter_by_attribute_regexes(self, attribute, regexes):
@@ -808,11 +1167,19 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: :py:class:`PipelineFileCollection` containing only :py:class:`PipelineFile` instances with the
             attribute matching the given pattern
         """
-        regexes = ensure_regex_list(regexes)
-        collection = self.__class__(
-            (f for f in self._s if matches_regexes(getattr(f, attribute), include_regexes=regexes)),
-            validate_unique=False
-        )
+        regexes = _ensure_regex_tuple(regexes)
+        values = map(attrgetter(attribute), self._members)
+
+        # the patterns are combined into a single match call for each value. Note that no literal prefix pre-filter
+        # (e.g. str.startswith) is applied, since the regex engine already rejects values not starting with a pattern's
+        # literal prefix before running the full match, and an additional Python-level test for each value was
+        # measured to be slower than the match alone
+        # each value is read once, and unset (e.g. None) values are never passed to the pattern, so that a file which
+        # has no value for the attribute is simply excluded rather than raising a TypeError
+        match = _get_regexes_matcher(regexes)
+        selectors = [v and match(v) for v in values]
+
+        collection = self._from_validated_iterable(compress(self._members, selectors))
         return collection
 
     # add method alias for backwards compatibility
@@ -826,7 +1193,7 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: :py:class:`PipelineFileCollection` containing only :py:class:`PipelineFile` instances with a True value
             for the given attribute
         """
-        collection = self.__class__((f for f in self._s if getattr(f, attribute)), validate_unique=False)
+        collection = self._from_validated_iterable(filter(attrgetter(attribute), self._members))
         return collection
 
     def filter_by_bool_attribute_not(self, attribute):
@@ -837,7 +1204,7 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: :py:class:`PipelineFileCollection` containing only :py:class:`PipelineFile` instances with a False
             value for the given attribute
         """
-        collection = self.__class__((f for f in self._s if not getattr(f, attribute)), validate_unique=False)
+        collection = self._from_validated_iterable(filterfalse(attrgetter(attribute), self._members))
         return collection
 
     def filter_by_bool_attributes_and(self, *attributes):
@@ -848,41 +1215,26 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: :py:class:`PipelineFileCollection` containing only :py:class:`PipelineFile` instances with a True value
             for all of the given attributes
         """
-        attributes_set = set(attributes)
-
-        def all_attributes_true(pf):
-            return all(getattr(pf, a) for a in attributes_set)
-
-        collection = self.__class__((f for f in self._s if all_attributes_true(f)), validate_unique=False)
+        collection = self._from_validated_iterable(_select_all_true(self._members, attributes))
         return collection
 
     def filter_by_bool_attributes_and_not(self, true_attributes, false_attributes):
         """Return a new :py:class:`PipelineFileCollection` containing only elements where *all* of the named
         true_attributes have a value of True and all of the false_attributes have a value of False
 
-        :param true_attributes: attributes which *must* be True
-        :param false_attributes: attributes which *must* be False
+        :param true_attributes: attribute, or sequence of attributes, which *must* be True
+        :param false_attributes: attribute, or sequence of attributes, which *must* be False
         :return: :py:class:`PipelineFileCollection` containing only :py:class:`PipelineFile` instances with a True value
             for all attributes named in true_attributes and a False value for all attributes named in false_attributes
         """
         if isinstance(true_attributes, str):
-            true_attributes = [true_attributes]
+            true_attributes = (true_attributes,)
         if isinstance(false_attributes, str):
-            false_attributes = [false_attributes]
+            false_attributes = (false_attributes,)
 
-        true_attributes_set = set(true_attributes)
-        false_attributes_set = set(false_attributes)
-
-        def check_true_attributes(pf):
-            return all(getattr(pf, a) for a in true_attributes_set)
-
-        def check_false_attributes(pf):
-            return not any(getattr(pf, a) for a in false_attributes_set)
-
-        collection = self.__class__(
-            (f for f in self._s if check_true_attributes(f) and check_false_attributes(f)),
-            validate_unique=False
-        )
+        # chain the two conditions, so that each file is only tested against the false attributes if it passed the first
+        true_files = _select_all_true(self._members, tuple(true_attributes))
+        collection = self._from_validated_iterable(_select_all_false(true_files, tuple(false_attributes)))
         return collection
 
     def filter_by_bool_attributes_not(self, *attributes):
@@ -893,12 +1245,7 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: :py:class:`PipelineFileCollection` containing only :py:class:`PipelineFile` instances with a False
             value for all of the given attributes
         """
-        attributes_set = set(attributes)
-
-        def no_attributes_true(pf):
-            return not any(getattr(pf, a) for a in attributes_set)
-
-        collection = self.__class__((f for f in self._s if no_attributes_true(f)), validate_unique=False)
+        collection = self._from_validated_iterable(_select_all_false(self._members, attributes))
         return collection
 
     def filter_by_bool_attributes_or(self, *attributes):
@@ -909,12 +1256,13 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: :py:class:`PipelineFileCollection` containing only :py:class:`PipelineFile` instances with a True value
             for any of the given attributes
         """
-        attributes_set = set(attributes)
+        if not attributes:
+            return self._from_validated_iterable(())
+        if len(attributes) == 1:
+            return self._from_validated_iterable(filter(attrgetter(attributes[0]), self._members))
 
-        def any_attributes_true(pf):
-            return any(getattr(pf, a) for a in attributes_set)
-
-        collection = self.__class__((f for f in self._s if any_attributes_true(f)), validate_unique=False)
+        selectors = map(any, map(attrgetter(*attributes), self._members))
+        collection = self._from_validated_iterable(compress(self._members, selectors))
         return collection
 
     def get_attribute_list(self, attribute):
@@ -923,7 +1271,7 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :param attribute: the attribute name to retrieve from the objects
         :return: :py:class:`list` containing the value of the given attribute for each file in the collection
         """
-        return [getattr(f, attribute) for f in self._s]
+        return list(map(attrgetter(attribute), self._members))
 
     def get_table_data(self):
         """Return :py:class:`PipelineFile` members in a simple tabular data format suitable for rendering into formatted
@@ -932,12 +1280,50 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: a :py:class:`tuple` with the first element being a list of columns, and the second being a 2D list of
             the data
         """
-        data = [OrderedDict(e) for e in self._s]
-        try:
-            columns = list(data[0].keys())
-        except IndexError:
-            columns = []
-        return columns, data
+        if not self._s:
+            return [], []
+
+        # resolve the columns and their getter once for the collection, instead of once per file
+        first_class = type(self._s[0])
+        columns, get_attributes = _get_public_attributes_getter(first_class)
+        data = [dict(zip(columns, get_attributes(f))) if type(f) is first_class else _get_public_attributes_dict(f)
+                for f in self._members]
+        return list(columns), data
+
+    def _group_by_attribute(self, attribute):
+        """Group the files in the collection by the value of the given attribute, excluding files where the value is
+        :py:const:`None`
+
+        :param attribute: the attribute to group by
+        :return: :py:class:`defaultdict` mapping each attribute value to a :py:class:`list` of files with that value
+        """
+        get_attribute = attrgetter(attribute)
+        groups = defaultdict(list)
+        for f in self._members:
+            value = get_attribute(f)
+            if value is not None:
+                groups[value].append(f)
+        return groups
+
+    def _get_unique_attributes(self, fileobj):
+        """Get the values of all of the unique attributes from a file in a single call
+
+        :param fileobj: member class instance
+        :return: :py:class:`tuple` containing the value of each attribute named in `unique_attributes`
+        """
+        return _get_attributes_getter(self.unique_attributes)(fileobj)
+
+    def _group_by_unique_attributes(self):
+        return {attribute: self._group_by_attribute(attribute) for attribute in self.unique_attributes}
+
+    @staticmethod
+    def _validate_unique_value_not_in_group(attribute, value, groups):
+        duplicates = groups.get(value)
+        if duplicates:
+            raise AttributeValidationError(
+                "{attribute} value '{value}' already set for file(s) '{duplicates}'".format(attribute=attribute,
+                                                                                            value=value,
+                                                                                            duplicates=duplicates))
 
     def validate_unique_attribute_value(self, attribute, value):
         """Check that a given value is not already in the collection for the given :py:class:`PipelineFile` attribute,
@@ -950,7 +1336,13 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :param value: the value being tested for uniqueness for the given attribute
         :return: None
         """
-        duplicates = [f for f in self._s if getattr(f, attribute) == value]
+        # the path index already groups the files by the indexed attribute, so this is a single lookup
+        if attribute == self.path_index_attribute:
+            self._validate_unique_value_not_in_group(attribute, value, self._path_index)
+            return
+
+        members = self._members
+        duplicates = list(compress(members, map(eq, map(attrgetter(attribute), members), repeat(value))))
         if duplicates:
             raise AttributeValidationError(
                 "{attribute} value '{value}' already set for file(s) '{duplicates}'".format(attribute=attribute,
@@ -966,9 +1358,15 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :return: None
         """
         validate_regexes(include_regexes)
-        unmatched = {f.name: getattr(f, attribute)
-                     for f in self._s
-                     if not matches_regexes(getattr(f, attribute), include_regexes=include_regexes)}
+        include_match = _get_regexes_matcher(_ensure_regex_tuple(include_regexes))
+        get_attribute = attrgetter(attribute)
+
+        unmatched = {}
+        for f in self._members:
+            value = get_attribute(f)
+            if not include_match(value):
+                unmatched[f.name] = value
+
         if unmatched:
             raise AttributeValidationError(
                 "invalid '{attribute}' values found for files: {unmatched}. Must match one of: {regexes}".format(
@@ -984,12 +1382,13 @@ class PipelineFileCollectionBase(MutableSet, metaclass=abc.ABCMeta):
         :param attribute: the attribute to compare
         :return: None
         """
-        counter = Counter(getattr(f, attribute) for f in self._s if getattr(f, attribute) is not None)
-        duplicate_values = [k for k, v in counter.items() if v > 1]
-        if duplicate_values:
-            duplicates = []
-            for value in duplicate_values:
-                duplicates.extend(f for f in self._s if getattr(f, attribute) == value)
+        # the path index already groups the files by the indexed attribute, so no pass over the collection is required
+        if attribute == self.path_index_attribute:
+            groups = ((value, files) for value, files in self._path_index.items() if value is not None)
+        else:
+            groups = self._group_by_attribute(attribute).items()
+        duplicates = list(chain.from_iterable(files for _, files in groups if len(files) > 1))
+        if duplicates:
             raise AttributeValidationError(
                 "duplicate attribute '{attribute}' found for files '{duplicates}'".format(attribute=attribute,
                                                                                           duplicates=duplicates))
@@ -1001,6 +1400,8 @@ validate_remotepipelinefile_or_string = validate_type((RemotePipelineFile, str))
 class RemotePipelineFileCollection(PipelineFileCollectionBase):
     """A PipelineFileCollectionBase subclass to hold a set of RemotePipelineFile instances
     """
+    __slots__ = []
+
     @classproperty
     def member_class(cls):
         return RemotePipelineFile
@@ -1017,6 +1418,10 @@ class RemotePipelineFileCollection(PipelineFileCollectionBase):
     def unique_attributes(cls):
         return 'local_path', 'dest_path'
 
+    @classproperty
+    def path_index_attribute(cls):
+        return 'dest_path'
+
     @classmethod
     def from_pipelinefilecollection(cls, pipelinefilecollection):
         return cls(RemotePipelineFile.from_pipelinefile(f) for f in pipelinefilecollection)
@@ -1043,6 +1448,8 @@ validate_pipelinefile_or_string = validate_type((PipelineFile, str))
 class PipelineFileCollection(PipelineFileCollectionBase):
     """A PipelineFileCollectionBase subclass to hold a set of PipelineFile instances
     """
+    __slots__ = []
+
     @classproperty
     def member_class(cls):
         return PipelineFile
@@ -1059,24 +1466,117 @@ class PipelineFileCollection(PipelineFileCollectionBase):
     def unique_attributes(cls):
         return 'archive_path', 'dest_path'
 
+    @classproperty
+    def path_index_attribute(cls):
+        return 'local_path'
+
     @classmethod
     def from_remotepipelinefilecollection(cls, remotepipelinefilecollection, are_deletions=False):
         return cls(PipelineFile.from_remotepipelinefile(f, is_deletion=are_deletions)
                    for f in remotepipelinefilecollection)
 
+    @classmethod
+    def from_paths(cls, paths, is_deletion=False, workers=None, validate_unique=True):
+        """Construct a PipelineFileCollection from a sequence of file paths, computing the file checksums (which are
+        required to add the files to the collection) concurrently, rather than one at a time as each file is added
+
+        :param paths: :py:class:`Iterable` of file paths
+        :param is_deletion: is_deletion flag passed to the :py:class:`PipelineFile` __init__ method for each path
+        :param workers: maximum number of threads used to compute checksums (defaults to the
+            :py:class:`concurrent.futures.ThreadPoolExecutor` default)
+        :param validate_unique: :py:class:`bool` passed to the `add` method
+        :return: PipelineFileCollection instance
+        """
+        validate_nonstring_iterable(paths)
+        validate_bool(is_deletion)
+
+        pipeline_files = []
+        for path in paths:
+            validate_string(path)
+            pipeline_files.append(PipelineFile(path, is_deletion=is_deletion))
+
+        # evaluate the lazy file_checksum property for each file in a thread pool, so that the checksums are already
+        # cached when the files are hashed upon being added to the collection. Executor.map preserves the input order.
+        if not is_deletion and pipeline_files:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(attrgetter('file_checksum'), pipeline_files):
+                    pass
+
+        return cls(pipeline_files, validate_unique=validate_unique)
+
     def add(self, pipeline_file, is_deletion=False, overwrite=False, validate_unique=True, **kwargs):
         self.member_validator(pipeline_file)
         validate_bool(is_deletion)
 
-        if not isinstance(pipeline_file, self.member_class) and not is_deletion and not os.path.isfile(pipeline_file):
-            raise MissingFileError("file '{src}' doesn't exist".format(src=pipeline_file))
-
-        return super().add(pipeline_file, overwrite=overwrite, validate_unique=validate_unique, is_deletion=is_deletion,
-                           **kwargs)
+        # a missing file is not stat'ed up front, since the checksum calculated when the new file is hashed by the
+        # superclass method (before the collection is modified) raises MissingFileError if the file can't be read
+        try:
+            return super().add(pipeline_file, overwrite=overwrite, validate_unique=validate_unique,
+                               is_deletion=is_deletion, **kwargs)
+        except MissingFileError:
+            is_path = not isinstance(pipeline_file, self.member_class)
+            if is_path and not is_deletion and not os.path.isfile(pipeline_file):
+                raise MissingFileError("file '{src}' doesn't exist".format(src=pipeline_file))
+            raise
 
     def _set_attribute(self, attribute, value):
-        for f in self._s:
-            setattr(f, attribute, value)
+        # resolve the attribute's data descriptor (typically a property) once, and call its setter directly for files of
+        # the member class, rather than having setattr resolve it again for every file
+        member_class = self.member_class
+        set_descriptor = getattr(getattr(member_class, attribute, None), '__set__', None)
+
+        for f in self._members:
+            if set_descriptor is not None and type(f) is member_class:
+                set_descriptor(f, value)
+            else:
+                setattr(f, attribute, value)
+
+    def _set_unique_path_attribute(self, attribute, path_function, predicate):
+        """Set a path attribute which must be unique within the collection, for each file which does not already have
+        the attribute set and for which the predicate is True
+
+        Values already assigned in the collection are grouped once up front and updated as new paths are set, so that
+        each candidate path is checked for uniqueness without a scan of the entire collection.
+
+        :param attribute: the path attribute to set
+        :param path_function: function used to determine the path from the file's src_path
+        :param predicate: function accepting a :py:class:`PipelineFile` and returning whether the path should be set
+        :return: None
+        """
+        get_attribute = attrgetter(attribute)
+        existing_values = self._group_by_attribute(attribute)
+
+        for f in self._members:
+            if get_attribute(f) is None and predicate(f):
+                candidate_path = path_function(f.src_path)
+                duplicates = existing_values.get(candidate_path)
+                if duplicates:
+                    raise AttributeValidationError(
+                        "{attribute} value '{value}' already set for file(s) '{duplicates}'".format(
+                            attribute=attribute, value=candidate_path, duplicates=duplicates))
+                setattr(f, attribute, candidate_path)
+                existing_values[candidate_path].append(f)
+
+    @contextmanager
+    def batched_updates(self):
+        """Context manager which defers the update callback of each file in the collection until the end of the block,
+        so that a file updated by several bulk operations (e.g. :py:meth:`set_publish_types` followed by
+        :py:meth:`set_check_types`) is reported by a single callback listing all of its updated properties, rather than
+        one callback per property
+
+        Files already being batched by an enclosing block are left to that block to report.
+
+        :return: None
+        """
+        batched_files = [f for f in self._members
+                         if f._file_update_callback is not None and f._pending_updates is None]
+        for f in batched_files:
+            f._pending_updates = {}
+        try:
+            yield
+        finally:
+            for f in batched_files:
+                f._flush_pending_updates()
 
     def set_archive_paths(self, archive_path_function):
         """Set archive_path attributes for each file in the collection
@@ -1086,11 +1586,8 @@ class PipelineFileCollection(PipelineFileCollectionBase):
         """
         validate_callable(archive_path_function)
 
-        for f in self._s:
-            if f.archive_path is None and f.should_archive:
-                candidate_path = archive_path_function(f.src_path)
-                self.validate_unique_attribute_value('archive_path', candidate_path)
-                f.archive_path = candidate_path
+        # the should_* properties are read-only views of their backing slots, so read the slots directly
+        self._set_unique_path_attribute('archive_path', archive_path_function, attrgetter('_should_archive'))
 
     def set_check_types(self, check_type):
         """Set check_type attributes for each file in the collection
@@ -1099,8 +1596,17 @@ class PipelineFileCollection(PipelineFileCollectionBase):
         :return: None
         """
         validate_settable_checktype(check_type)
-        additions = self.__class__(f for f in self._s if not f.is_deletion)
-        additions._set_attribute('check_type', check_type)
+
+        # the value is validated once above and deletions are skipped here, so for files of the member class the value
+        # is assigned without repeating both checks in the property setter for every file
+        member_class = self.member_class
+        for f in self._members:
+            if f.is_deletion:
+                continue
+            if type(f) is member_class:
+                f._set_validated_check_type(check_type)
+            else:
+                f.check_type = check_type
 
     def set_dest_paths(self, dest_path_function):
         """Set dest_path attributes for each file in the collection
@@ -1110,11 +1616,10 @@ class PipelineFileCollection(PipelineFileCollectionBase):
         """
         validate_callable(dest_path_function)
 
-        for f in self._s:
-            if f.dest_path is None and any((f.should_store, f.should_harvest)):
-                candidate_path = dest_path_function(f.src_path)
-                self.validate_unique_attribute_value('dest_path', candidate_path)
-                f.dest_path = candidate_path
+        def should_publish(pf):
+            return pf._should_store or pf._should_harvest
+
+        self._set_unique_path_attribute('dest_path', dest_path_function, should_publish)
 
     def set_bool_attribute(self, attribute, value):
         """Set a :py:class:`bool` attribute for each file in the collection
@@ -1124,7 +1629,19 @@ class PipelineFileCollection(PipelineFileCollectionBase):
         :return: None
         """
         validate_bool(value)
-        self._set_attribute(attribute, value)
+
+        if attribute not in _BOOL_STATE_ATTRIBUTES:
+            self._set_attribute(attribute, value)
+            return
+
+        # the value has already been validated, so for files of the member class it is assigned without the redundant
+        # validation performed by the property setter
+        member_class = self.member_class
+        for f in self._members:
+            if type(f) is member_class:
+                f._set_validated_bool_state(attribute, value)
+            else:
+                setattr(f, attribute, value)
 
     def set_publish_types(self, publish_type):
         """Set publish_type attributes for each file in the collection
@@ -1133,7 +1650,21 @@ class PipelineFileCollection(PipelineFileCollectionBase):
         :return: None
         """
         validate_publishtype(publish_type)
-        self._set_attribute('publish_type', publish_type)
+
+        # validate the publish type once against each kind of file present, before any file is modified, then assign it
+        # without validation for files of the member class, rather than repeating the validation for every file
+        is_deletion_values = set(map(attrgetter('is_deletion'), self._members))
+        if True in is_deletion_values:
+            validate_deletion_publishtype(publish_type)
+        if False in is_deletion_values:
+            validate_addition_publishtype(publish_type)
+
+        member_class = self.member_class
+        for f in self._members:
+            if type(f) is member_class:
+                f._set_validated_publish_type(publish_type)
+            else:
+                f.publish_type = publish_type
 
     def set_string_attribute(self, attribute, value):
         """Set a string attribute for each file in the collection
@@ -1151,7 +1682,7 @@ class PipelineFileCollection(PipelineFileCollectionBase):
         :param file_update_callback: callback (function)
         :return: None
         """
-        for f in self._s:
+        for f in self._members:
             f.file_update_callback = file_update_callback
 
     def set_default_check_types(self, check_params=None):
@@ -1168,14 +1699,21 @@ class PipelineFileCollection(PipelineFileCollectionBase):
 
         checks = check_params.get('checks', ())
 
-        all_additions = self.__class__(f for f in self._s if not f.is_deletion)
-        netcdf_additions = self.__class__(f for f in all_additions if f.file_type is FileType.NETCDF)
-        non_netcdf_additions = all_additions.difference(netcdf_additions)
-
         netcdf_check_type = PipelineFileCheckType.NC_COMPLIANCE_CHECK if checks else PipelineFileCheckType.FORMAT_CHECK
-
-        netcdf_additions.set_check_types(netcdf_check_type)
-        non_netcdf_additions.set_check_types(PipelineFileCheckType.FORMAT_CHECK)
+        default_check_type = PipelineFileCheckType.FORMAT_CHECK
+        netcdf_file_type = FileType.NETCDF
+
+        # both check types are known to be valid for additions, so for files of the member class they are assigned
+        # without validation, as in set_check_types
+        member_class = self.member_class
+        for f in self._members:
+            if f.is_deletion:
+                continue
+            check_type = netcdf_check_type if f.file_type is netcdf_file_type else default_check_type
+            if type(f) is member_class:
+                f._set_validated_check_type(check_type)
+            else:
+                f.check_type = check_type
 
     def set_publish_types_from_regexes(self, include_regexes, exclude_regexes, addition_type, deletion_type):
         """Set publish_type attribute for each file in the collection depending on whether it is considered "included"
@@ -1191,9 +1729,16 @@ class PipelineFileCollection(PipelineFileCollectionBase):
         if exclude_regexes:
             validate_regexes(exclude_regexes)
 
-        for f in self._s:
-            if matches_regexes(f.name, include_regexes, exclude_regexes):
-                f.publish_type = deletion_type if f.is_deletion else addition_type
+        include_match = _get_regexes_matcher(_ensure_regex_tuple(include_regexes))
+        exclude_match = _get_regexes_matcher(_ensure_regex_tuple(exclude_regexes))
+
+        # match against a flat list of names first, then only visit the matched files to assign the publish type
+        names = map(attrgetter('name'), self._members)
+        selectors = [include_match(n) and not exclude_match(n) for n in names]
+        publish_types = (addition_type, deletion_type)
+
+        for f in compress(self._members, selectors):
+            f.publish_type = publish_types[f.is_deletion]
 
 
 validate_pipelinefilecollection = validate_type(PipelineFileCollection)
@@ -2,24 +2,51 @@
 Geonetwork Library
 """
 import contextlib
+import gzip
 import json
-import os
-from io import StringIO
-from xml.etree import ElementTree
+import re
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
 
 # 'requests>=2.5' is a dependency of tableschema (and possibly other aodncore requirements), however should tableschema
 # no longer be required, it may be necessary to explicitly install 'requests'
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, RequestException
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
 
-from ..util import list_not_empty, generate_id
+from ..util import generate_id
 from .exceptions import GeonetworkRequestError, GeonetworkConnectionError
 
+# orjson is an optional, faster JSON encoder which serialises directly to bytes. The fallback produces the same compact,
+# UTF-8 encoded output using the standard library encoder
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
 
 BASE_API = "srv/api/0.1"
 ENDPOINT_RECORD_GET = 'records'
 ENDPOINT_BATCH_UPDATE = 'records/batchediting'
 
+# headers for requests with a JSON body, which replace the default Accept header
+_JSON_HEADERS = {"accept": "application/json", "content-type": "application/json"}
+
+# minimum size (in bytes) of a request body which is compressed, if request compression is enabled
+COMPRESSION_THRESHOLD = 1024
+
+# declarations of the namespaces which are used in the extent elements of the update payload
+NAMESPACE_PREFIXES = ('mri', 'gex', 'gml', 'gco')
+_NAMESPACE_DECLARATION_PATTERN = re.compile(
+    r"""\bxmlns:({prefixes})\s*=\s*(["'])(.*?)\2""".format(prefixes='|'.join(NAMESPACE_PREFIXES)))
+_NAMESPACE_DECLARATION_BYTES_PATTERN = re.compile(_NAMESPACE_DECLARATION_PATTERN.pattern.encode('ascii'))
+
+# entities escaped in attribute values, in addition to &, < and >
+_ATTRIBUTE_ENTITIES = {'"': '&quot;'}
+
 
 def dict_to_xml(tag, value=None, attr=None, elems=None, display=True):
     """Convert a dictionary of XML nodes into a nested XML string
@@ -33,19 +60,40 @@ def dict_to_xml(tag, value=None, attr=None, elems=None, display=True):
     :param display: boolen to identify whether the element (and child nodes) should be rendered to the XML string
     :return: an XML string
     """
+    fragments = []
+    _append_xml_fragments(fragments, tag, value=value, attr=attr, elems=elems, display=display)
+    return ''.join(fragments)
+
+
+def _append_xml_fragments(fragments, tag, value=None, attr=None, elems=None, display=True):
+    """Append the fragments of the XML string described by the remaining parameters (as for :py:func:`dict_to_xml`) to
+    a list, so that the complete string for a nested template is only joined once
+
+    :param fragments: :py:class:`list` to which the string fragments are appended
+    :return: None
+    """
     if isinstance(tag, list):
-        nodes = {'tag': tag[-1], 'elems': elems, 'attr': attr, 'value': value}
+        # the parent elements have no attributes or values of their own, so their tags are appended directly around the
+        # last element, rather than building a nested dict for each of them. Note that 'display' is not applied here.
+        for t in tag[:-1]:
+            fragments.extend(('<', t, '>'))
+        _append_xml_fragments(fragments, tag[-1], value=value, attr=attr, elems=elems)
         for t in reversed(tag[:-1]):
-            nodes = {'tag': t, 'elems': [nodes]}
-        return dict_to_xml(**nodes)
+            fragments.extend(('</', t, '>'))
+        return
     if not display:
-        return ''
-    attr = [] if attr is None else [' {}="{}"'.format(k, v) for k, v in attr.items()]
+        return
+    # attribute values are escaped, whereas element values are not, since they may themselves contain XML markup (e.g.
+    # the GML polygon for the geographic extent)
+    attributes = '' if not attr else ''.join(
+        [' {}="{}"'.format(k, escape(str(v), _ATTRIBUTE_ENTITIES)) for k, v in attr.items()])
+    fragments.extend(('<', tag, attributes, '>'))
     if elems:
-        value = ''
         for elem in elems:
-            value += dict_to_xml(**elem)
-    return '<{tag}{attributes}>{value}</{tag}>'.format(tag=tag, attributes=' '.join(attr), value=value)
+            _append_xml_fragments(fragments, **elem)
+    else:
+        fragments.append('{}'.format(value))
+    fragments.extend(('</', tag, '>'))
 
 
 @contextlib.contextmanager
@@ -58,49 +106,82 @@ def geonetwork_exception_handler():
         raise GeonetworkRequestError(e)
 
 
+def get_session(retries=3, backoff_factor=0.2):
+    """Get a :py:class:`requests.Session` with a connection pool which retries transient gateway errors, for sharing
+    between :py:class:`Geonetwork` instances so that connections to the same host are kept alive and reused
+
+    :param retries: number of times to retry a failed request
+    :param backoff_factor: backoff factor applied between retries
+    :return: :py:class:`requests.Session` instance
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=Retry(total=retries, backoff_factor=backoff_factor,
+                                            status_forcelist=(502, 503, 504)))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 class Geonetwork(object):
     """Geonetwork API session handler
 
     :param base_url: Geonetwork instance base url
     :param username: username for the Geonetwork API
     :param password: password for the Geonetwork API
-    :param logger: an instance of the logger
+    :param session: optional existing :py:class:`requests.Session` (e.g. from :py:func:`get_session`), so that
+        connections may be reused across instances. A new, plain session is created if not supplied. The credentials
+        and XSRF token are sent with each request rather than set on the session, so instances sharing a session keep
+        their own.
+    :param compress_requests: gzip compress request bodies larger than :py:const:`COMPRESSION_THRESHOLD`. This must
+        only be enabled if the Geonetwork instance (or a proxy in front of it) decodes gzip encoded request bodies.
     """
-    def __init__(self, base_url, username, password):
+    def __init__(self, base_url, username, password, session=None, compress_requests=False):
         self.base_url = base_url
+        self.compress_requests = compress_requests
 
-        self.session = requests.Session()
-        self.session.verify = True
-        self.session.auth = (username, password)
+        # the API URLs are built once, by joining with '/' rather than using OS path logic
+        api_url = '/'.join((base_url.rstrip('/'), BASE_API))
+        self._api_url = api_url
+        self._record_url_prefix = '/'.join((api_url, ENDPOINT_RECORD_GET, ''))
+        self._batch_update_url = '/'.join((api_url, ENDPOINT_BATCH_UPDATE))
+
+        self.session = requests.Session() if session is None else session
+        self._auth = (username, password)
 
         # init cookies
-        url = os.path.join(self.base_url, BASE_API)
         with geonetwork_exception_handler():
-            self.session.post(url)
+            self.session.post(self._api_url, auth=self._auth)
 
+        self._headers = CaseInsensitiveDict({'Accept': 'application/xml'})
         for cookie in self.session.cookies:
             if cookie.name == "XSRF-TOKEN":
-                self.session.headers.update({'X-XSRF-TOKEN': cookie.value})
-        self.session.headers.update({'Accept': 'application/xml'})
+                self._headers['X-XSRF-TOKEN'] = cookie.value
+        self._json_headers = self._headers.copy()
+        self._json_headers.update(_JSON_HEADERS)
 
-    def _get(self, path):
-        url = os.path.join(self.base_url, path)
+    def _get(self, url):
         with geonetwork_exception_handler():
-            response = self.session.get(url)
+            response = self.session.get(url, auth=self._auth, headers=self._headers)
             response.raise_for_status()
         return response
 
-    def _post(self, path, data=None, params=None):
-        url = os.path.join(self.base_url, path)
+    def _post(self, url, data=None, params=None):
         with geonetwork_exception_handler():
-            response = self.session.post(url, data=json.dumps(data), params=params)
+            response = self.session.post(url, data=_json_dumps(data), params=params, auth=self._auth,
+                                         headers=self._headers)
             response.raise_for_status()
         return response
 
-    def _put(self, path, data=None, params=None, headers=None):
-        url = os.path.join(self.base_url, path)
+    def _put(self, url, data=None, params=None):
+        body = _json_dumps(data)
+        headers = self._json_headers
+        if self.compress_requests and len(body) > COMPRESSION_THRESHOLD:
+            body = gzip.compress(body)
+            headers = headers.copy()
+            headers['Content-Encoding'] = 'gzip'
+
         with geonetwork_exception_handler():
-            response = self.session.put(url, data=json.dumps(data), params=params, headers=headers)
+            response = self.session.put(url, data=body, params=params, auth=self._auth, headers=headers)
             response.raise_for_status()
         return response
 
@@ -109,7 +190,15 @@ class Geonetwork(object):
 
         :param _uuid: Geonetwork record ID
         :return: xml of specified metadata record"""
-        return self._get(os.path.join(BASE_API, ENDPOINT_RECORD_GET, _uuid)).text
+        return self._get(self._record_url_prefix + _uuid).text
+
+    def get_record_bytes(self, _uuid):
+        """Retrieve a metadata record as the raw response body, without decoding it to a string (which requires the
+        encoding to be detected from the content of the entire record when the response doesn't declare it)
+
+        :param _uuid: Geonetwork record ID
+        :return: UTF-8 encoded xml of specified metadata record"""
+        return self._get(self._record_url_prefix + _uuid).content
 
     def update_record(self, _uuid, changes):
         """Update Geonetwork record
@@ -118,8 +207,24 @@ class Geonetwork(object):
         :param changes: list of change dicts where each change contains a value and an xpath
         """
         params = {"uuids": _uuid}
-        headers = {"accept": "application/json", "content-type": "application/json"}
-        self._put(os.path.join(BASE_API, ENDPOINT_BATCH_UPDATE), data=changes, params=params, headers=headers)
+        self._put(self._batch_update_url, data=changes, params=params)
+
+    def update_records(self, changes_per_uuid):
+        """Update multiple Geonetwork records, with a single request for each distinct set of changes
+
+        The batch editing endpoint applies the same changes to every record it is given, so only records with identical
+        changes are updated together.
+
+        :param changes_per_uuid: dict mapping Geonetwork record ID to a list of change dicts (as for
+            :py:meth:`update_record`)
+        """
+        uuids_per_changes = {}
+        for _uuid, changes in changes_per_uuid.items():
+            uuids, _ = uuids_per_changes.setdefault(_json_dumps(changes), ([], changes))
+            uuids.append(_uuid)
+
+        for uuids, changes in uuids_per_changes.values():
+            self._put(self._batch_update_url, data=changes, params={"uuids": uuids})
 
 
 class GeonetworkMetadataHandler(object):
@@ -144,18 +249,61 @@ class GeonetworkMetadataHandler(object):
         self.spatial_data = {}
         self.vertical_data = {}
         self.temporal_data = {}
-        self.xml_text = None
+        self._xml_text = None
+        self._xml_bytes = None
+
+    @property
+    def xml_bytes(self):
+        """The raw, UTF-8 encoded source metadata record, as fetched by :py:meth:`run`
+
+        :return: :py:class:`bytes` record, or None if the record is not set or was set as text
+        """
+        return self._xml_bytes
+
+    @xml_bytes.setter
+    def xml_bytes(self, value):
+        self._xml_bytes = value
+        self._xml_text = None
+
+    @property
+    def xml_text(self):
+        """The source metadata record as a string, decoded from :py:attr:`xml_bytes` on first access if the record was
+        set as bytes
+
+        :return: :py:class:`str` record, or None if the record is not set
+        """
+        if self._xml_text is None and self._xml_bytes is not None:
+            self._xml_text = self._xml_bytes.decode('utf-8')
+        return self._xml_text
+
+    @xml_text.setter
+    def xml_text(self, value):
+        self._xml_text = value
+        self._xml_bytes = None
 
     def get_namespace_dict(self):
-        """Scrape relevant namespaces from source metadata record"""
-        ns_raw = dict([
-            node for (_, node) in ElementTree.iterparse(StringIO(self.xml_text), events=['start-ns'])
-        ])
-        ns_keep = ['mri', 'gex', 'gml', 'gco']
+        """Scrape relevant namespaces from source metadata record
+
+        The namespaces are typically all declared on the root element, so rather than parsing the (potentially large)
+        record, the namespace declarations are scanned for directly, using the first declaration of each and stopping
+        as soon as each of the relevant namespaces has been found.
+
+        The raw record (:py:attr:`xml_bytes`) is scanned if it is set, otherwise the decoded record
+        (:py:attr:`xml_text`).
+        """
+        if self._xml_bytes is not None:
+            matches = _NAMESPACE_DECLARATION_BYTES_PATTERN.finditer(self._xml_bytes)
+        else:
+            matches = _NAMESPACE_DECLARATION_PATTERN.finditer(self._xml_text)
+
         ns = {}
-        for k, v in ns_raw.items():
-            if k in ns_keep:
-                ns['xmlns:{}'.format(k)] = v
+        for match in matches:
+            prefix, _, uri = match.groups()
+            if isinstance(uri, bytes):
+                prefix, uri = prefix.decode('ascii'), uri.decode('utf-8')
+            ns.setdefault('xmlns:{}'.format(prefix), uri)
+            if len(ns) == len(NAMESPACE_PREFIXES):
+                break
         return ns
 
     def build_api_payload(self):
@@ -212,16 +360,21 @@ class GeonetworkMetadataHandler(object):
         ]
 
     def run(self):
-        if list_not_empty([self.spatial, self.temporal, self.vertical]):
+        if self.spatial is not None or self.temporal is not None or self.vertical is not None:
             self._logger.info('Collecting extent data for {}'.format(self.uuid))
-            if self.spatial:
-                self.spatial_data = self._conn.get_spatial_extent(**self.spatial)
-            if self.temporal:
-                self.temporal_data = self._conn.get_temporal_extent(**self.temporal)
-            if self.vertical:
-                self.vertical_data = self._conn.get_vertical_extent(**self.vertical)
-
-            self.xml_text = self._session.get_record(self.uuid)
+
+            # the record is fetched from Geonetwork in the background while the extents are queried, so that the latency
+            # of the two overlaps. The extent queries remain sequential, since they share the one database connection.
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                record_future = executor.submit(self._session.get_record_bytes, self.uuid)
+                if self.spatial:
+                    self.spatial_data = self._conn.get_spatial_extent(**self.spatial)
+                if self.temporal:
+                    self.temporal_data = self._conn.get_temporal_extent(**self.temporal)
+                if self.vertical:
+                    self.vertical_data = self._conn.get_vertical_extent(**self.vertical)
+                self.xml_bytes = record_future.result()
+
             payload = self.build_api_payload()
             self._logger.info('Updating extent data for {}'.format(self.uuid))
             self._session.update_record(_uuid=self.uuid, changes=payload)
@@ -2,6 +2,7 @@ import logging
 import logging.config
 import os
 import platform
+import time
 from datetime import datetime
 from tempfile import gettempdir
 
@@ -18,7 +19,7 @@ from .schema import (validate_check_params, validate_custom_params, validate_har
                      validate_resolve_params)
 from .statequery import StateQuery
 from .steps import (get_check_runner, get_harvester_runner, get_notify_runner, get_resolve_runner, get_store_runner)
-from ..util import (ensure_regex_list, ensure_writeonceordereddict, format_exception,
+from ..util import (classproperty, ensure_regex_list, ensure_writeonceordereddict, format_exception,
                     get_file_checksum, iter_public_attributes, lazyproperty, matches_regexes, merge_dicts,
                     validate_relative_path_attr, TemporaryDirectory, WfsBroker, DEFAULT_WFS_VERSION)
 from aodncore import __version__ as _aodncore_version
@@ -276,6 +277,15 @@ class HandlerBase(object):
     all_transitions = ordered_transitions[:]
     all_transitions.extend(other_transitions)
 
+    @classproperty(lazy=True)
+    def _ignored_attributes(cls):
+        # built once for each class, since subclasses may extend all_states with their own state helpers. file_checksum
+        # is ignored, since it would otherwise be calculated (reading the entire input file) whenever the handler is
+        # represented as a string
+        return frozenset(['celery_task', 'config', 'default_deletion_publish_type', 'file_checksum',
+                          'input_file_object', 'logger', 'state', 'state_query', 'trigger'] +
+                         ["is_{state}".format(state=s) for s in cls.all_states])
+
     def __init__(self, input_file,
                  allowed_archive_path_regexes=None,
                  allowed_dest_path_regexes=None,
@@ -319,7 +329,7 @@ class HandlerBase(object):
         self._logger = None
         self._result = HandlerResult.UNKNOWN
         self._should_notify = None
-        self._start_time = datetime.now()
+        self._start_time = time.time()
 
         # public attributes
         self.input_file = input_file
@@ -359,11 +369,7 @@ class HandlerBase(object):
                                 after_state_change='_after_state_change')
 
     def __iter__(self):
-        ignored_attributes = {'celery_task', 'config', 'default_deletion_publish_type',
-                              'input_file_object', 'logger', 'state', 'state_query', 'trigger'}
-        ignored_attributes.update("is_{state}".format(state=s) for s in self.all_states)
-
-        return iter_public_attributes(self, ignored_attributes)
+        return iter_public_attributes(self, self._ignored_attributes)
 
     def __str__(self):
         return "{name}({attrs})".format(name=self.__class__.__name__, attrs=dict(self))
@@ -457,9 +463,15 @@ class HandlerBase(object):
     def file_checksum(self):
         """Read-only property to access the :py:attr:`input_file` checksum
 
+        The checksum is only calculated when first accessed, so that the input file is not read in full by handlers
+        which never use it. It must therefore first be read while the input file still exists (i.e. before the input
+        file is moved or deleted), otherwise an :py:exc:`OSError` is raised.
+
         :return: :attr:`input_file` checksum string
         :rtype: :class:`str`
         """
+        if self._file_checksum is None:
+            self._file_checksum = get_file_checksum(self.input_file)
         return self._file_checksum
 
     @property
@@ -588,7 +600,7 @@ class HandlerBase(object):
         :return: timestamp of handler starting time
         :rtype: :py:class:`datetime.datetime`
         """
-        return self._start_time
+        return datetime.fromtimestamp(self._start_time)
 
     @lazyproperty
     def state_query(self):
@@ -958,12 +970,13 @@ class HandlerBase(object):
             self.logger.exception('error during _handle_success method: {e}'.format(e=format_exception(e)))
 
     def _set_input_file_attributes(self):
+        # the input file must be readable, however the checksum is not calculated until it is required
         try:
-            self._file_checksum = get_file_checksum(self.input_file)
+            with open(self.input_file, 'rb'):
+                pass
         except (IOError, OSError) as e:
             self.logger.exception(e)
             raise InvalidInputFileError(e)
-        self.logger.sysinfo("get_file_checksum -> '{self.file_checksum}'".format(self=self))
 
         self._file_basename = os.path.basename(self.input_file)
         self.logger.sysinfo("file_basename -> '{self._file_basename}'".format(self=self))
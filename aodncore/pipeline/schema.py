@@ -276,33 +276,57 @@ JSON_MANIFEST_SCHEMA = {
 }
 
 
+_VALIDATORS = {}
+
+
+def _validate(instance, schema):
+    """Validate an instance against one of the schemas in this module, in the same manner as
+    :py:func:`jsonschema.validate`, except that the schema itself is only checked, and the validator only created, once
+    for each schema rather than on every call
+
+    :param instance: object to validate
+    :param schema: schema :py:class:`dict` (which must be one of the module level schema constants)
+    :return: None
+    """
+    try:
+        validator = _VALIDATORS[id(schema)]
+    except KeyError:
+        cls = jsonschema.validators.validator_for(schema)
+        cls.check_schema(schema)
+        validator = _VALIDATORS[id(schema)] = cls(schema)
+
+    error = jsonschema.exceptions.best_match(validator.iter_errors(instance))
+    if error is not None:
+        raise error
+
+
 def validate_check_params(check_params):
-    jsonschema.validate(check_params, CHECK_PARAMS_SCHEMA)
+    _validate(check_params, CHECK_PARAMS_SCHEMA)
 
 
 def validate_custom_params(check_params):
-    jsonschema.validate(check_params, CUSTOM_PARAMS_SCHEMA)
+    _validate(check_params, CUSTOM_PARAMS_SCHEMA)
 
 
 def validate_harvest_params(harvest_params):
-    jsonschema.validate(harvest_params, HARVEST_PARAMS_SCHEMA)
+    _validate(harvest_params, HARVEST_PARAMS_SCHEMA)
 
 
 def validate_logging_config(logging_config):
-    jsonschema.validate(logging_config, LOGGING_CONFIG_SCHEMA)
+    _validate(logging_config, LOGGING_CONFIG_SCHEMA)
 
 
 def validate_notify_params(notify_params):
-    jsonschema.validate(notify_params, NOTIFY_PARAMS_SCHEMA)
+    _validate(notify_params, NOTIFY_PARAMS_SCHEMA)
 
 
 def validate_pipeline_config(pipeline_config):
-    jsonschema.validate(pipeline_config, PIPELINE_CONFIG_SCHEMA)
+    _validate(pipeline_config, PIPELINE_CONFIG_SCHEMA)
 
 
 def validate_resolve_params(resolve_params):
-    jsonschema.validate(resolve_params, RESOLVE_PARAMS_SCHEMA)
+    _validate(resolve_params, RESOLVE_PARAMS_SCHEMA)
 
 
 def validate_json_manifest(json_manifest):
-    jsonschema.validate(json_manifest, JSON_MANIFEST_SCHEMA)
+    _validate(json_manifest, JSON_MANIFEST_SCHEMA)
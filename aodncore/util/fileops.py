@@ -48,6 +48,9 @@ __all__ = [
     'validate_file_writable'
 ]
 
+CHECKSUM_ALGORITHM_ENVVAR = 'AODN_CHECKSUM_ALGO'
+DEFAULT_CHECKSUM_ALGORITHM = 'sha256'
+
 # allow for consistent sorting of filesystem directory listings
 locale.setlocale(locale.LC_ALL, 'C')
 filesystem_sort_key = cmp_to_key(locale.strcoll)
@@ -127,19 +130,36 @@ def extract_zip(zip_path, dest_dir):
         z.extractall(dest_dir)
 
 
-def get_file_checksum(filepath, block_size=65536, algorithm='sha256'):
+def get_file_checksum(filepath, block_size=1048576, algorithm=None):
     """Get the hash (checksum) of a file
 
     :param filepath: path to the input file
     :param block_size: number of bytes to hash each iteration
-    :param algorithm: hash algorithm (from :py:mod:`hashlib` module)
+    :param algorithm: hash algorithm (from :py:mod:`hashlib` module), defaulting to the value of the
+        AODN_CHECKSUM_ALGO environment variable if set, otherwise 'sha256'
     :return: hash of the input file
     """
-    hash_function = getattr(hashlib, algorithm)
-    hasher = hash_function()
+    if algorithm is None:
+        algorithm = os.environ.get(CHECKSUM_ALGORITHM_ENVVAR, DEFAULT_CHECKSUM_ALGORITHM)
+    hasher = hashlib.new(algorithm)
+    # read into a single reused buffer, rather than allocating a new bytes object per block
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
     with open(filepath, 'rb') as f:
-        for block in iter(partial(f.read, block_size), b''):
-            hasher.update(block)
+        # the file is read once from start to finish, so advise the kernel to read ahead aggressively. The advice is
+        # only a hint, so it is skipped where unsupported (e.g. on Windows, or for pipes)
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        length = f.readinto(buffer)
+        hasher.update(view[:length])
+        # a buffered read only returns less than a full block at EOF, so a file no larger than a single block is hashed
+        # from one read call, without a second read to detect EOF
+        if length == block_size:
+            for length in iter(partial(f.readinto, buffer), 0):
+                hasher.update(view[:length])
     return hasher.hexdigest()
 
 
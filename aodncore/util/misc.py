@@ -10,6 +10,7 @@ import sys
 import types
 from collections import Iterable, OrderedDict, Mapping
 from enum import Enum, EnumMeta
+from functools import lru_cache
 from io import StringIO
 import uuid
 import random
@@ -199,6 +200,17 @@ def is_valid_email_address(address):
     return regex.match(address)
 
 
+@lru_cache(maxsize=None)
+def _get_property_names(cls):
+    """Get the names of the properties defined by a class (including inherited properties), which are the same for
+    every instance and are therefore only determined once for each class
+
+    :param cls: class
+    :return: :py:class:`frozenset` of property names
+    """
+    return frozenset(p for p in dir(cls) if isinstance(getattr(cls, p), property))
+
+
 def iter_public_attributes(instance, ignored_attributes=None):
     """Get an iterator over an instance's public attributes, *including* properties
 
@@ -206,7 +218,8 @@ def iter_public_attributes(instance, ignored_attributes=None):
     :param ignored_attributes: set of attribute names to exclude
     :return: iterator over the instances public attributes
     """
-    ignored_attributes = {} if ignored_attributes is None else set(ignored_attributes)
+    if ignored_attributes is None:
+        ignored_attributes = frozenset()
 
     def includeattr(attr):
         if attr.startswith('_') or attr in ignored_attributes:
@@ -214,7 +227,7 @@ def iter_public_attributes(instance, ignored_attributes=None):
         return True
 
     attribute_names = set(getattr(instance, '__slots__', getattr(instance, '__dict__', {})))
-    property_names = {p for p in dir(instance.__class__) if isinstance(getattr(instance.__class__, p), property)}
+    property_names = _get_property_names(instance.__class__)
     all_names = attribute_names.union(property_names)
 
     public_attrs = {a: getattr(instance, a) for a in all_names if includeattr(a)}
@@ -233,12 +246,9 @@ def matches_regexes(input_string, include_regexes, exclude_regexes=None):
     includes = ensure_regex_list(include_regexes)
     excludes = ensure_regex_list(exclude_regexes)
 
-    matches_includes = any(re.match(r, input_string) for r in includes)
-    matches_excludes = any(re.match(r, input_string) for r in excludes)
-
-    if matches_includes and not matches_excludes:
-        return True
-    return False
+    # the patterns are already compiled, so call their match methods directly rather than via re.match, and only test
+    # the exclusions when the string matches one of the inclusions
+    return any(r.match(input_string) for r in includes) and not any(r.match(input_string) for r in excludes)
 
 
 def merge_dicts(*args):
@@ -1,5 +1,6 @@
 import os
 import sys
+from datetime import datetime
 from functools import partial
 from unittest.mock import patch
 
@@ -129,6 +130,40 @@ class TestDummyHandler(HandlerTestCase):
         nonexistent_file = get_nonexistent_path()
         self.run_handler_with_exception(InvalidInputFileError, nonexistent_file, dest_path_function=dest_path_testing)
 
+    @patch('aodncore.pipeline.handlerbase.get_file_checksum')
+    def test_file_checksum_lazy(self, mock_get_file_checksum):
+        mock_get_file_checksum.return_value = 'checksum'
+        handler = self.run_handler(self.temp_nc_file)
+        self.assertIn('file_basename', dict(handler))
+        mock_get_file_checksum.assert_not_called()
+
+        self.assertEqual('checksum', handler.file_checksum)
+        self.assertEqual('checksum', handler.file_checksum)
+        mock_get_file_checksum.assert_called_once_with(self.temp_nc_file)
+
+    def test_ignored_attributes_extended_states(self):
+        class ExtendedStatesHandler(DummyHandler):
+            all_states = DummyHandler.all_states + ['HANDLER_CUSTOM']
+
+            @property
+            def is_HANDLER_CUSTOM(self):
+                return False
+
+        self.assertIn('is_HANDLER_CUSTOM', ExtendedStatesHandler._ignored_attributes)
+        self.assertNotIn('is_HANDLER_CUSTOM', DummyHandler._ignored_attributes)
+        self.assertIn('is_HANDLER_INITIAL', DummyHandler._ignored_attributes)
+
+        handler = ExtendedStatesHandler(self.temp_nc_file, config=self.config)
+        handler.run()
+        self.assertNotIn('is_HANDLER_CUSTOM', dict(handler))
+
+    def test_start_time(self):
+        before = datetime.now()
+        handler = self.run_handler(self.temp_nc_file)
+        self.assertIsInstance(handler.start_time, datetime)
+        self.assertLessEqual(before, handler.start_time)
+        self.assertLessEqual(handler.start_time, datetime.now())
+
     def test_run_handler_twice(self):
         handler = self.run_handler(self.temp_nc_file)
         with self.assertRaises(HandlerAlreadyRunError):
@@ -1,6 +1,9 @@
 import os
+import re
 import uuid
-from collections import MutableSet, OrderedDict
+import warnings
+from collections import OrderedDict
+from collections.abc import MutableSet
 from unittest.mock import patch
 
 from aodncore.pipeline.common import (CheckResult, PipelineFileCheckType, PipelineFilePublishType)
@@ -80,12 +83,18 @@ class TestPipelineFile(BaseTestCase):
         duplicate_file = PipelineFile(GOOD_NC, name='pipelinefile')
         self.assertFalse(id(self.pipelinefile) == id(duplicate_file))
         self.assertTrue(self.pipelinefile == duplicate_file)
+        self.assertEqual(hash(self.pipelinefile), hash(duplicate_file))
+        self.assertEqual(hash(duplicate_file), hash(duplicate_file))
 
     def test_unequal_files(self):
         different_file = PipelineFile(BAD_NC, name='pipelinefile')
         self.assertFalse(id(self.pipelinefile) == id(different_file))
         self.assertFalse(self.pipelinefile == different_file)
 
+        # files which differ by path are unequal without needing a checksum, even if the file can't be read
+        nonexistent_file = PipelineFile(get_nonexistent_path(), name='pipelinefile')
+        self.assertFalse(self.pipelinefile == nonexistent_file)
+
     def test_format_check(self):
         # Test file format checking
         check_runner = get_child_check_runner(PipelineFileCheckType.FORMAT_CHECK, None, self.test_logger)
@@ -253,6 +262,10 @@ class TestPipelineFile(BaseTestCase):
         self.pipelinefile.is_stored = True
         self.assertTrue(test_callback_instance.test_attribute)
         self.assertEqual(test_callback_instance.test_kwargs['name'], self.pipelinefile.name)
+        self.assertEqual(test_callback_instance.test_kwargs['message'], str({'is_stored': True}))
+
+        self.pipelinefile.dest_path = 'dest/path'
+        self.assertEqual(test_callback_instance.test_kwargs['message'], str({'dest_path': 'dest/path'}))
 
 
 class TestRemotePipelineFile(BaseTestCase):
@@ -292,6 +305,22 @@ class TestPipelineFileCollection(BaseTestCase):
         expected_collection = PipelineFileCollection(PipelineFile(GOOD_NC, dest_path=dest_path, name='custom_name'))
         self.assertEqual(collection, expected_collection)
 
+    def test_from_paths(self):
+        collection = PipelineFileCollection.from_paths([GOOD_NC, BAD_NC], workers=2)
+        expected_collection = PipelineFileCollection([GOOD_NC, BAD_NC])
+        self.assertEqual(collection, expected_collection)
+        self.assertListEqual([GOOD_NC, BAD_NC], collection.get_attribute_list('src_path'))
+
+        deletion_path = get_nonexistent_path()
+        deletion_collection = PipelineFileCollection.from_paths([deletion_path], is_deletion=True)
+        self.assertTrue(deletion_collection[0].is_deletion)
+
+        with self.assertRaises(MissingFileError):
+            PipelineFileCollection.from_paths([GOOD_NC, get_nonexistent_path()])
+
+        with self.assertRaises(DuplicatePipelineFileError):
+            PipelineFileCollection.from_paths([GOOD_NC, GOOD_NC])
+
     def test_add(self):
         p1 = PipelineFile(GOOD_NC)
         p2 = PipelineFile(GOOD_NC)
@@ -355,6 +384,34 @@ class TestPipelineFileCollection(BaseTestCase):
         with self.assertRaises(AttributeValidationError):
             self.collection.add(p2)
 
+    def test_update_duplicate_dest_path(self):
+        p1 = PipelineFile(GOOD_NC)
+        p1.publish_type = PipelineFilePublishType.UPLOAD_ONLY
+        p1.dest_path = 'FIXED_DEST_PATH'
+
+        p2 = PipelineFile(BAD_NC)
+        p2.publish_type = PipelineFilePublishType.UPLOAD_ONLY
+        p2.dest_path = 'FIXED_DEST_PATH'
+
+        # duplicate within the sequence being added
+        with self.assertRaises(AttributeValidationError):
+            self.collection.update([p1, p2])
+        self.assertSetEqual({p1}, self.collection)
+
+        # duplicate of a file already in the collection
+        with self.assertRaises(AttributeValidationError):
+            self.collection.update([p2])
+
+        # overwriting the existing file frees its dest_path for the replacement
+        p3 = PipelineFile(GOOD_NC)
+        p3.publish_type = PipelineFilePublishType.UPLOAD_ONLY
+        p3.dest_path = 'FIXED_DEST_PATH'
+        self.collection.update([p3], overwrite=True)
+        self.assertSetEqual({p3}, self.collection)
+
+        with self.assertRaises(AttributeValidationError):
+            PipelineFileCollection([p1, p2])
+
     def test_add_duplicate_dest_path_without_validation(self):
         p1 = PipelineFile(GOOD_NC)
         p1.publish_type = PipelineFilePublishType.UPLOAD_ONLY
@@ -541,8 +598,9 @@ class TestPipelineFileCollection(BaseTestCase):
 
     def test_nonexistent_file(self):
         # Adding/discarding/membership testing filesystem paths
-        with self.assertRaises(MissingFileError):
-            self.collection.add(os.path.join('/nonexistent/path/with/a/{uuid}/in/the/middle'.format(uuid=uuid.uuid4())))
+        nonexistent_path = os.path.join('/nonexistent/path/with/a/{uuid}/in/the/middle'.format(uuid=uuid.uuid4()))
+        with self.assertRaisesRegex(MissingFileError, "file '{path}' doesn't exist".format(path=nonexistent_path)):
+            self.collection.add(nonexistent_path)
 
     @patch("aodncore.pipeline.files.get_file_checksum")
     @patch("os.path.isfile")
@@ -563,12 +621,22 @@ class TestPipelineFileCollection(BaseTestCase):
         self.collection.discard(f2)
         self.assertNotIn(f2, self.collection)
 
+        self.assertIsNone(self.collection.get_pipelinefile_from_src_path(f1))
+
         self.collection.update([f1, f2])
         self.assertIn(f1, self.collection)
         self.assertIn(f2, self.collection)
+        self.assertEqual(f1, self.collection.get_pipelinefile_from_src_path(f1).src_path)
+        self.assertEqual(f2, self.collection[1:].get_pipelinefile_from_src_path(f2).src_path)
+        self.assertIsNone(self.collection[1:].get_pipelinefile_from_src_path(f1))
+
+        # unhashable values are not found, rather than raising from the path index lookup
+        self.assertNotIn([f1], self.collection)
+        self.assertIsNone(self.collection.get_pipelinefile_from_src_path([f1]))
 
         self.collection.clear()
         self.assertCountEqual(self.collection, set())
+        self.assertIsNone(self.collection.get_pipelinefile_from_src_path(f1))
 
     def test_pipelinefile_objects(self):
         # Test add/discard/remove methods for PipelineFile instances
@@ -612,6 +680,75 @@ class TestPipelineFileCollection(BaseTestCase):
         collection_slice = self.collection.get_attribute_list('name')[250:750]
         self.assertListEqual(names_slice, collection_slice)
 
+    def test_getitem(self):
+        f1 = get_nonexistent_path()
+        f2 = get_nonexistent_path()
+        f3 = get_nonexistent_path()
+        fileobj1 = PipelineFile(f1, is_deletion=True)
+        fileobj2 = PipelineFile(f2, is_deletion=True)
+        fileobj3 = PipelineFile(f3, is_deletion=True)
+        self.collection.update((fileobj1, fileobj2, fileobj3))
+
+        self.assertIs(self.collection[1], fileobj2)
+        self.assertIs(self.collection[-1], fileobj3)
+
+        collection_slice = self.collection[1:]
+        self.assertIsInstance(collection_slice, PipelineFileCollection)
+        self.assertListEqual(list(collection_slice), [fileobj2, fileobj3])
+
+        # scans skip elements which have been removed from the middle of the collection
+        self.collection.discard(fileobj2)
+        self.assertListEqual([f1, f3], self.collection.get_attribute_list('src_path'))
+        self.assertListEqual([fileobj1, fileobj3], list(self.collection.filter_by_bool_attribute('is_deletion')))
+        self.assertIs(self.collection[1], fileobj3)
+        self.assertIn(fileobj3, self.collection)
+
+    def test_scan_while_iterating_after_discard(self):
+        fileobjs = [PipelineFile(get_nonexistent_path(), is_deletion=True) for _ in range(8)]
+        self.collection.update(fileobjs)
+
+        # scanning the collection (e.g. by filtering) while it is being iterated must not shift the remaining members
+        visited = []
+        for f in self.collection:
+            visited.append(f)
+            if f is fileobjs[0]:
+                self.collection.discard(f)
+                _ = self.collection.filter_by_bool_attribute('is_deletion')
+                self.collection.set_bool_attribute('is_harvested', True)
+
+        self.assertListEqual(fileobjs, visited)
+        self.assertListEqual(fileobjs[1:], list(self.collection))
+
+    def test_intersection(self):
+        f1 = get_nonexistent_path()
+        f2 = get_nonexistent_path()
+        fileobj1 = PipelineFile(f1, is_deletion=True)
+        fileobj2 = PipelineFile(f2, is_deletion=True)
+        self.collection.update((fileobj1, fileobj2))
+
+        intersection = self.collection.intersection([fileobj2])
+        self.assertIsInstance(intersection, PipelineFileCollection)
+        self.assertListEqual([fileobj2], list(intersection))
+        self.assertIs(fileobj2, intersection.get_pipelinefile_from_src_path(f2))
+
+    def test_difference(self):
+        f1 = get_nonexistent_path()
+        f2 = get_nonexistent_path()
+        f3 = get_nonexistent_path()
+        fileobj1 = PipelineFile(f1, is_deletion=True)
+        fileobj2 = PipelineFile(f2, is_deletion=True)
+        fileobj3 = PipelineFile(f3, is_deletion=True)
+        self.collection.update((fileobj1, fileobj2, fileobj3))
+
+        difference = self.collection.difference([fileobj2])
+        self.assertIsInstance(difference, PipelineFileCollection)
+        self.assertListEqual([fileobj1, fileobj3], list(difference))
+        self.assertIsNone(difference.get_pipelinefile_from_src_path(f2))
+
+        other_collection = PipelineFileCollection([fileobj1, fileobj3])
+        self.assertListEqual([fileobj2], list(self.collection.difference(other_collection)))
+        self.assertListEqual([fileobj1, fileobj3], list(self.collection.intersection(other_collection)))
+
     def test_issubset(self):
         f1 = get_nonexistent_path()
         f2 = get_nonexistent_path()
@@ -645,6 +782,9 @@ class TestPipelineFileCollection(BaseTestCase):
         union = self.collection.union(collection2)
         self.assertSetEqual(union, PipelineFileCollection((fileobj1, fileobj2, fileobj3)))
 
+        generator_union = self.collection.union(f for f in (fileobj3,))
+        self.assertSetEqual(generator_union, PipelineFileCollection((fileobj1, fileobj2, fileobj3)))
+
         with self.assertRaises(TypeError):
             self.collection.union([1, 2, 3])
 
@@ -696,6 +836,32 @@ class TestPipelineFileCollection(BaseTestCase):
         filtered_collection = self.collection.filter_by_attribute_regexes('dest_path', '^FOO/[1-3]$')
         self.assertSetEqual(filtered_collection, {fileobj1, fileobj2})
 
+        filtered_collection = self.collection.filter_by_attribute_regexes('dest_path', ['^FOO/1$', re.compile('^BAR')])
+        self.assertSetEqual(filtered_collection, {fileobj1, fileobj4})
+
+        # patterns with differing flags or with groups are still matched individually
+        filtered_collection = self.collection.filter_by_attribute_regexes('dest_path',
+                                                                          [re.compile('^foo/1$', re.IGNORECASE),
+                                                                           '^BAR'])
+        self.assertSetEqual(filtered_collection, {fileobj1, fileobj4})
+        filtered_collection = self.collection.filter_by_attribute_regexes('dest_path', [r'^(FOO)/\d$', '^BAR'])
+        self.assertSetEqual(filtered_collection, {fileobj1, fileobj2, fileobj4})
+
+        # patterns with global inline flags are not combined, since the flags must be at the start of the expression
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            filtered_collection = self.collection.filter_by_attribute_regexes('dest_path', ['(?i)^foo/1$', '(?i)^bar'])
+        self.assertSetEqual(filtered_collection, {fileobj1, fileobj4})
+
+        filtered_collection = self.collection.filter_by_attribute_regexes('dest_path', None)
+        self.assertSetEqual(filtered_collection, set())
+
+        # files with no value for the attribute are excluded
+        fileobj5 = PipelineFile(get_nonexistent_path(), is_deletion=True)
+        self.collection.add(fileobj5)
+        filtered_collection = self.collection.filter_by_attribute_regexes('dest_path', '.*')
+        self.assertSetEqual(filtered_collection, {fileobj1, fileobj2, fileobj3, fileobj4})
+
     @patch("aodncore.pipeline.files.get_file_checksum")
     @patch("os.path.isfile")
     def test_filter_by_bool_attribute(self, mock_isfile, mock_get_file_checksum):
@@ -754,6 +920,9 @@ class TestPipelineFileCollection(BaseTestCase):
         filtered_collection2 = self.collection.filter_by_bool_attributes_and('is_deletion', 'should_store')
         self.assertSetEqual(filtered_collection2, PipelineFileCollection((fileobj2,)))
 
+        filtered_collection3 = self.collection.filter_by_bool_attributes_and('should_store')
+        self.assertSetEqual(filtered_collection3, PipelineFileCollection((fileobj1, fileobj2)))
+
     @patch("aodncore.pipeline.files.get_file_checksum")
     @patch("os.path.isfile")
     def test_filter_by_bool_attributes_and_not(self, mock_isfile, mock_get_file_checksum):
@@ -822,6 +991,10 @@ class TestPipelineFileCollection(BaseTestCase):
 
         self.assertSetEqual(filtered_collection, PipelineFileCollection((fileobj1, fileobj2)))
 
+        filtered_collection = self.collection.filter_by_bool_attributes_or()
+        self.assertIsInstance(filtered_collection, PipelineFileCollection)
+        self.assertSetEqual(filtered_collection, set())
+
     def test_get_slices(self):
         f1 = get_nonexistent_path()
         f2 = get_nonexistent_path()
@@ -868,6 +1041,8 @@ class TestPipelineFileCollection(BaseTestCase):
         fileobj2_keys = list(OrderedDict(fileobj2).keys())
         self.assertSequenceEqual(fileobj1_keys, table_headers)
         self.assertSequenceEqual(fileobj2_keys, table_headers)
+        self.assertListEqual(sorted(table_headers), table_headers)
+        self.assertListEqual([dict(fileobj1), dict(fileobj2)], table_data)
 
     def test_get_table_data_empty(self):
         table_headers, table_data = self.collection.get_table_data()
@@ -897,6 +1072,17 @@ class TestPipelineFileCollection(BaseTestCase):
 
         with self.assertNoException():
             self.collection.set_bool_attribute('is_harvested', True)
+        self.assertTrue(all(f.is_harvested for f in self.collection))
+
+        updates = []
+        self.collection.set_file_update_callback(lambda **kwargs: updates.append(kwargs))
+        self.collection.set_bool_attribute('is_stored', True)
+        self.assertTrue(all(f.is_stored for f in self.collection))
+        self.assertListEqual([str({'is_stored': True})] * 3, [u['message'] for u in updates])
+
+        # attributes with additional setter logic still go through the setter
+        with self.assertRaises(ValueError):
+            self.collection.set_bool_attribute('should_undo', True)
 
     @patch("aodncore.pipeline.files.get_file_checksum")
     @patch("os.path.isfile")
@@ -914,6 +1100,18 @@ class TestPipelineFileCollection(BaseTestCase):
         with self.assertRaises(ValueError):
             self.collection.set_check_types('invalid_type')
 
+        updates = []
+        deletion = PipelineFile(get_nonexistent_path(), is_deletion=True)
+        self.collection.add(deletion)
+        self.collection.set_file_update_callback(lambda **kwargs: updates.append(kwargs))
+        self.collection.set_check_types(PipelineFileCheckType.FORMAT_CHECK)
+
+        self.assertIs(PipelineFileCheckType.UNSET, deletion.check_type)
+        self.assertIs(PipelineFileCheckType.FORMAT_CHECK, fileobj1.check_type)
+        self.assertIs(PipelineFileCheckType.FORMAT_CHECK, fileobj2.check_type)
+        self.assertListEqual([fileobj1.name, fileobj2.name], [u['name'] for u in updates])
+        self.assertIn('FORMAT_CHECK', updates[0]['message'])
+
     @patch("aodncore.pipeline.files.get_file_checksum")
     @patch("os.path.isfile")
     def test_set_default_check_types(self, mock_isfile, mock_get_file_checksum):
@@ -944,6 +1142,62 @@ class TestPipelineFileCollection(BaseTestCase):
         with self.assertRaises(TypeError):
             self.collection.set_publish_types('invalid_type')
 
+        # an addition type is invalid for the deletions, so no files are modified
+        addition = PipelineFile(GOOD_NC)
+        self.collection.add(addition)
+        with self.assertRaises(ValueError):
+            self.collection.set_publish_types(PipelineFilePublishType.HARVEST_UPLOAD)
+        self.assertIs(fileobj1.publish_type, PipelineFilePublishType.DELETE_UNHARVEST)
+        self.assertIs(addition.publish_type, PipelineFilePublishType.UNSET)
+
+        self.collection.discard(fileobj1)
+        self.collection.discard(fileobj2)
+        self.collection.set_publish_types(PipelineFilePublishType.HARVEST_UPLOAD)
+        self.assertIs(addition.publish_type, PipelineFilePublishType.HARVEST_UPLOAD)
+        self.assertTrue(addition.should_harvest and addition.should_store)
+        self.assertFalse(addition.should_archive)
+
+    def test_batched_updates(self):
+        messages = []
+
+        def callback(**kwargs):
+            messages.append(kwargs['message'])
+
+        fileobj1 = PipelineFile(GOOD_NC, file_update_callback=callback)
+        fileobj2 = PipelineFile(BAD_NC)
+        self.collection.update((fileobj1, fileobj2))
+
+        with self.collection.batched_updates():
+            self.collection.set_publish_types(PipelineFilePublishType.HARVEST_UPLOAD)
+            self.collection.set_check_types(PipelineFileCheckType.FORMAT_CHECK)
+            self.collection.set_publish_types(PipelineFilePublishType.UPLOAD_ONLY)
+            self.assertListEqual([], messages)
+
+        self.assertListEqual([str({'publish_type': 'UPLOAD_ONLY', 'check_type': 'FORMAT_CHECK'})], messages)
+
+        # updates outside of a batch are sent immediately again
+        fileobj1.is_stored = True
+        self.assertEqual(str({'is_stored': True}), messages[-1])
+
+    def test_set_publish_types_from_regexes(self):
+        fileobj1 = PipelineFile(get_nonexistent_path(), name='INCLUDED_1.nc', is_deletion=True)
+        fileobj2 = PipelineFile(get_nonexistent_path(), name='INCLUDED_2.nc', is_deletion=True)
+        fileobj3 = PipelineFile(get_nonexistent_path(), name='EXCLUDED.nc', is_deletion=True)
+        self.collection.update((fileobj1, fileobj2, fileobj3))
+
+        self.collection.set_publish_types_from_regexes([r'^INCLUDED_.*\.nc$', re.compile(r'^EXCLUDED')], [r'.*_2\.nc$'],
+                                                       PipelineFilePublishType.HARVEST_UPLOAD,
+                                                       PipelineFilePublishType.DELETE_UNHARVEST)
+
+        self.assertIs(fileobj1.publish_type, PipelineFilePublishType.DELETE_UNHARVEST)
+        self.assertIs(fileobj2.publish_type, PipelineFilePublishType.UNSET)
+        self.assertIs(fileobj3.publish_type, PipelineFilePublishType.DELETE_UNHARVEST)
+
+        with self.assertRaises(TypeError):
+            self.collection.set_publish_types_from_regexes(r'^INCLUDED_.*\.nc$', None,
+                                                           PipelineFilePublishType.HARVEST_UPLOAD,
+                                                           PipelineFilePublishType.DELETE_UNHARVEST)
+
     @patch("aodncore.pipeline.files.get_file_checksum")
     @patch("os.path.isfile")
     def test_set_string_attribute(self, mock_isfile, mock_get_file_checksum):
@@ -1000,6 +1254,19 @@ class TestRemotePipelineFileCollection(BaseTestCase):
         broker.assert_download_call_count(1)
         self.assertCountEqual(local_paths, expected)
 
+    def test_validate_attribute_uniqueness_dest_path(self):
+        with self.assertNoException():
+            self.remote_collection.validate_attribute_uniqueness('dest_path')
+
+        duplicate = RemotePipelineFile('dest/path/1.nc', name='duplicate.nc')
+        self.remote_collection.add(duplicate, validate_unique=False)
+        with self.assertRaises(AttributeValidationError):
+            self.remote_collection.validate_attribute_uniqueness('dest_path')
+
+        self.remote_collection.discard(duplicate)
+        with self.assertNoException():
+            self.remote_collection.validate_attribute_uniqueness('dest_path')
+
     def test_file_objects(self):
         f1 = RemotePipelineFile('dest/path/1.nc', name='1.nc')
         f2 = RemotePipelineFile('dest/path/3.nc', name='3.nc')
@@ -1023,6 +1290,21 @@ class TestRemotePipelineFileCollection(BaseTestCase):
         self.assertIn('dest/path/1.nc', self.remote_collection)
         self.assertNotIn('dest/path/3.nc', self.remote_collection)
 
+        f1 = self.remote_collection.get_pipelinefile_from_dest_path('dest/path/1.nc')
+        self.assertEqual(f1.name, '1.nc')
+
+        self.remote_collection.discard('dest/path/1.nc')
+        self.assertNotIn('dest/path/1.nc', self.remote_collection)
+        self.assertIsNone(self.remote_collection.get_pipelinefile_from_dest_path('dest/path/1.nc'))
+
+        self.remote_collection.add(f1)
+        self.assertIn('dest/path/1.nc', self.remote_collection)
+        self.assertIn('dest/path/1.nc', self.remote_collection[1:])
+        self.assertNotIn('dest/path/2.nc', self.remote_collection[1:])
+
+        self.remote_collection.clear()
+        self.assertNotIn('dest/path/2.nc', self.remote_collection)
+
     def test_keys(self):
         actual = self.remote_collection.keys()
         expected = ['dest/path/1.nc', 'dest/path/2.nc']
@@ -1,3 +1,5 @@
+import gzip
+import json
 import os
 from io import StringIO
 from unittest.mock import Mock, patch
@@ -6,8 +8,8 @@ import xml.etree.ElementTree as ET
 import requests
 
 from aodncore.pipeline.exceptions import GeonetworkRequestError, GeonetworkConnectionError
-from aodncore.pipeline.geonetwork import (Geonetwork, GeonetworkMetadataHandler, dict_to_xml,
-                                          geonetwork_exception_handler)
+from aodncore.pipeline.geonetwork import (Geonetwork, GeonetworkMetadataHandler, _json_dumps, dict_to_xml,
+                                          geonetwork_exception_handler, get_session)
 from aodncore.testlib import BaseTestCase
 from test_aodncore import TESTDATA_DIR
 
@@ -64,6 +66,19 @@ class TestHelperFunctions(BaseTestCase):
 
         self.assertEqual(expect, actual)
 
+        actual = dict_to_xml('elem', value='<gml:Polygon/>', attr={'id': 'a "quoted" <&> value'})
+        self.assertEqual('<elem id="a &quot;quoted&quot; &lt;&amp;&gt; value"><gml:Polygon/></elem>', actual)
+
+        actual = dict_to_xml('elem', value='value', attr={'xmlns:gex': 'gex', 'xmlns:gml': 'gml'})
+        self.assertEqual('<elem xmlns:gex="gex" xmlns:gml="gml">value</elem>', actual)
+
+    def test_json_dumps(self):
+        changes = [{'value': '<gex:EX_Extent>°</gex:EX_Extent>', 'xpath': './/mri:extent'}]
+        actual = _json_dumps(changes)
+
+        self.assertIsInstance(actual, bytes)
+        self.assertEqual(changes, json.loads(actual))
+
     def test_geonetwork_exception_handler(self):
         session = requests.Session()
 
@@ -110,7 +125,29 @@ class TestGeonetwork(BaseTestCase):
             gn = Geonetwork(os.path.join(TEST_BASE_URL, 'post'), USERNAME, PASSWORD)
 
         self.assertEqual('https://postman-echo.com/post', gn.base_url)
-        self.assertEqual((USERNAME, PASSWORD), gn.session.auth)
+        self.assertEqual((USERNAME, PASSWORD), gn._auth)
+
+    @patch('aodncore.pipeline.geonetwork.requests.Session.post')
+    def test_instantiate_geonetwork_shared_session(self, mock_post):
+        session = get_session()
+        gn1 = Geonetwork(os.path.join(TEST_BASE_URL, 'post'), USERNAME, PASSWORD, session=session)
+        gn2 = Geonetwork(os.path.join(TEST_BASE_URL, 'post'), 'other', 'other_password', session=session)
+
+        self.assertIs(session, gn1.session)
+        self.assertIs(session, gn2.session)
+        self.assertEqual(3, session.get_adapter(TEST_BASE_URL).max_retries.total)
+
+        # credentials are kept per instance, not set on the shared session
+        self.assertIsNone(session.auth)
+        self.assertEqual((USERNAME, PASSWORD), gn1._auth)
+        self.assertEqual(('other', 'other_password'), gn2._auth)
+        self.assertNotIn('X-XSRF-TOKEN', session.headers)
+
+    @patch('aodncore.pipeline.geonetwork.requests.Session.post')
+    def test_instantiate_geonetwork_default_session(self, mock_post):
+        gn = Geonetwork(os.path.join(TEST_BASE_URL, 'post'), USERNAME, PASSWORD)
+
+        self.assertEqual(0, gn.session.get_adapter(TEST_BASE_URL).max_retries.total)
 
     @patch('aodncore.pipeline.geonetwork.requests.Session.get')
     def test_get_record(self, mock_get):
@@ -120,6 +157,8 @@ class TestGeonetwork(BaseTestCase):
         with self.assertNoException():
             result = gn.get_record('123456')
         self.assertEqual(result, 'mock response')
+        mock_get.assert_called_once_with('https://postman-echo.com/get/srv/api/0.1/records/123456',
+                                         auth=(USERNAME, PASSWORD), headers=gn._headers)
 
     @patch('aodncore.pipeline.geonetwork.requests.Session.put')
     def test_update_record(self, mock_put):
@@ -129,6 +168,38 @@ class TestGeonetwork(BaseTestCase):
         with self.assertNoException():
             gn.update_record(None, None)
 
+    @patch('aodncore.pipeline.geonetwork.requests.Session.post')
+    @patch('aodncore.pipeline.geonetwork.requests.Session.put')
+    def test_update_records(self, mock_put, mock_post):
+        mock_put.return_value = self._mock_response(content="mock response")
+        gn = Geonetwork(os.path.join(TEST_BASE_URL, 'post'), USERNAME, PASSWORD)
+        changes = [{'value': '<gn_replace/>', 'xpath': './/mri:extent'}]
+        other_changes = [{'value': '<gn_replace>other</gn_replace>', 'xpath': './/mri:extent'}]
+
+        gn.update_records({'1': changes, '2': other_changes, '3': changes})
+
+        self.assertEqual(2, mock_put.call_count)
+        self.assertListEqual([['1', '3'], ['2']], [c[1]['params']['uuids'] for c in mock_put.call_args_list])
+        self.assertEqual(changes, json.loads(mock_put.call_args_list[0][1]['data']))
+
+    @patch('aodncore.pipeline.geonetwork.requests.Session.post')
+    @patch('aodncore.pipeline.geonetwork.requests.Session.put')
+    def test_update_record_compressed(self, mock_put, mock_post):
+        mock_put.return_value = self._mock_response(content="mock response")
+        gn = Geonetwork(os.path.join(TEST_BASE_URL, 'post'), USERNAME, PASSWORD, compress_requests=True)
+        small_changes = [{'value': '<gn_replace/>', 'xpath': './/mri:extent'}]
+        large_changes = [{'value': '<gn_replace>{}</gn_replace>'.format('x' * 2048), 'xpath': './/mri:extent'}]
+
+        gn.update_record('1', small_changes)
+        _, kwargs = mock_put.call_args
+        self.assertNotIn('content-encoding', kwargs['headers'])
+        self.assertEqual(small_changes, json.loads(kwargs['data']))
+
+        gn.update_record('1', large_changes)
+        _, kwargs = mock_put.call_args
+        self.assertEqual('gzip', kwargs['headers']['content-encoding'])
+        self.assertEqual(large_changes, json.loads(gzip.decompress(kwargs['data'])))
+
 
 class TestGeonetworkMetadataHandler(BaseTestCase):
     def test_metadata_handler(self):
@@ -152,6 +223,19 @@ class TestGeonetworkMetadataHandler(BaseTestCase):
 
         self.assertDictEqual(ns, NAMESPACES)
 
+        handler.xml_text = "<mdb:MD_Metadata xmlns:mdb='mdb' xmlns:gex='gex' xmlns:mri = 'mri'>" \
+                           "<mri:x xmlns:gex='nested'/></mdb:MD_Metadata>"
+        self.assertDictEqual({'xmlns:gex': 'gex', 'xmlns:mri': 'mri'}, handler.get_namespace_dict())
+
+        with open(GOOD_XML, 'rb') as xml:
+            handler.xml_bytes = xml.read()
+        self.assertDictEqual(NAMESPACES, handler.get_namespace_dict())
+
+        # setting the record as text replaces a record previously set as bytes
+        handler.xml_text = "<mdb:MD_Metadata xmlns:gex='gex'/>"
+        self.assertIsNone(handler.xml_bytes)
+        self.assertDictEqual({'xmlns:gex': 'gex'}, handler.get_namespace_dict())
+
     def test_build_api_payload(self):
         handler = GeonetworkMetadataHandler(None, None, METADATA, None)
         with open(GOOD_XML, encoding='utf-8') as xml:
@@ -168,8 +252,8 @@ class TestGeonetworkMetadataHandler(BaseTestCase):
         mock_conn.get_temporal_extent.return_value = {'min_value': '1900-01-01', 'max_value': '1900-01-02'}
         mock_conn.get_vertical_extent.return_value = {'min_value': 0, 'max_value': 1}
         mock_session = Mock()
-        with open(GOOD_XML, encoding='utf-8') as xml:
-            mock_session.get_record.return_value = xml.read()
+        with open(GOOD_XML, 'rb') as xml:
+            mock_session.get_record_bytes.return_value = xml.read()
         handler = GeonetworkMetadataHandler(mock_conn, mock_session, METADATA, self.test_logger)
         print(handler.xml_text)
 
@@ -181,6 +265,10 @@ class TestGeonetworkMetadataHandler(BaseTestCase):
         assert mock_conn.get_vertical_extent.called, 'Vertical extent method was not called but should have been'
         assert mock_session.update_record.called, 'Update record method was not called but should have been'
 
+        # the fetched record is also available decoded, for callers which read the record after the handler has run
+        with open(GOOD_XML, 'rb') as xml:
+            self.assertEqual(xml.read().decode('utf-8'), handler.xml_text)
+
     def test_run_no_metadata(self):
         mock_conn = Mock()
         mock_session = Mock()
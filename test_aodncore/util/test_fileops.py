@@ -1,11 +1,14 @@
 import filecmp
 import gzip
+import hashlib
 import os
 import socket
+import unittest
 import uuid
 import zipfile
 from io import open
 from tempfile import mkdtemp, mkstemp, TemporaryDirectory
+from unittest.mock import patch
 
 from aodncore.testlib import BaseTestCase, get_nonexistent_path
 from aodncore.util import (dir_exists, extract_gzip, extract_zip, is_gzip_file, is_jpeg_file, is_netcdf_file, is_pdf_file,
@@ -289,6 +292,40 @@ class TestUtilFileOps(BaseTestCase):
         actual_checksum = get_file_checksum(temp_file_path)
         self.assertEqual(expected_checksum, actual_checksum)
 
+        expected_blake2b_checksum = hashlib.blake2b(b'foobar').hexdigest()
+        self.assertEqual(expected_blake2b_checksum, get_file_checksum(temp_file_path, algorithm='blake2b'))
+
+        with patch.dict(os.environ, {'AODN_CHECKSUM_ALGO': 'md5'}):
+            self.assertEqual('3858f62230ac3c915f300c664312c63f', get_file_checksum(temp_file_path))
+
+        # file larger than block_size is hashed over several reads, including a partial final block
+        self.assertEqual(expected_checksum, get_file_checksum(temp_file_path, block_size=4))
+
+        # file sizes which are an exact multiple of block_size, or smaller than a single block
+        self.assertEqual(expected_checksum, get_file_checksum(temp_file_path, block_size=3))
+        self.assertEqual(expected_checksum, get_file_checksum(temp_file_path, block_size=6))
+        self.assertEqual(expected_checksum, get_file_checksum(temp_file_path, block_size=7))
+
+        empty_file_path = os.path.join(self.temp_dir, str(uuid.uuid4()))
+        open(empty_file_path, 'w').close()
+        self.assertEqual(hashlib.sha256(b'').hexdigest(), get_file_checksum(empty_file_path))
+
+    @unittest.skipUnless(hasattr(os, 'posix_fadvise'), 'posix_fadvise not supported on this platform')
+    def test_get_file_checksum_fadvise(self):
+        temp_file_path = os.path.join(self.temp_dir, str(uuid.uuid4()))
+        with open(temp_file_path, 'w') as f:
+            f.write(u'foobar')
+
+        with patch('aodncore.util.fileops.os.posix_fadvise') as mock_fadvise:
+            self.assertEqual(hashlib.sha256(b'foobar').hexdigest(), get_file_checksum(temp_file_path))
+        mock_fadvise.assert_called_once()
+        _, offset, length, advice = mock_fadvise.call_args[0]
+        self.assertEqual((0, 0, os.POSIX_FADV_SEQUENTIAL), (offset, length, advice))
+
+        # the advice is only a hint, so failing to apply it doesn't prevent the checksum being calculated
+        with patch('aodncore.util.fileops.os.posix_fadvise', side_effect=OSError):
+            self.assertEqual(hashlib.sha256(b'foobar').hexdigest(), get_file_checksum(temp_file_path))
+
     def test_temporary_directory(self):
         with TemporaryDirectory() as d:
             self.assertTrue(os.path.isdir(d))